@@ -40,9 +40,28 @@ def create_template():
     return template_path
 
 
-def example_software_architecture():
+def apply_positions(graph, positions=None):
+    """
+    Override node positions with precomputed layout coordinates.
+
+    Args:
+        graph: Graph dict with 'nodes' and 'edges'
+        positions: Optional mapping of node ID to {"x": ..., "y": ...}; nodes
+            not in the mapping keep their default position
+
+    Returns:
+        The graph dict with positions applied
+    """
+    if positions:
+        for node in graph["nodes"]:
+            if node["id"] in positions:
+                node["position"] = positions[node["id"]]
+    return graph
+
+
+def example_software_architecture(positions=None):
     """Example: Software architecture diagram."""
-    return {
+    graph = {
         "nodes": [
             {
                 "id": "user",
@@ -89,11 +108,12 @@ def example_software_architecture():
             {"from": "app", "to": "db", "label": "Query"},
         ],
     }
+    return apply_positions(graph, positions)
 
 
-def example_workflow():
+def example_workflow(positions=None):
     """Example: Workflow/process diagram."""
-    return {
+    graph = {
         "nodes": [
             {
                 "id": "start",
@@ -133,11 +153,12 @@ def example_workflow():
             {"from": "fulfill", "to": "complete", "label": "Done"},
         ],
     }
+    return apply_positions(graph, positions)
 
 
-def example_network_topology():
+def example_network_topology(positions=None):
     """Example: Network topology diagram."""
-    return {
+    graph = {
         "nodes": [
             {"id": "internet", "name": "Internet", "position": {"x": 4, "y": 0.5}},
             {"id": "router", "name": "Router", "detail": "Main Gateway", "position": {"x": 4, "y": 2}},
@@ -158,11 +179,12 @@ def example_network_topology():
             {"from": "switch2", "to": "server4", "label": "100Mbps"},
         ],
     }
+    return apply_positions(graph, positions)
 
 
-def example_org_chart():
+def example_org_chart(positions=None):
     """Example: Organizational chart."""
-    return {
+    graph = {
         "nodes": [
             {
                 "id": "ceo",
@@ -200,6 +222,7 @@ def example_org_chart():
             {"from": "cto", "to": "devops", "label": "Manages"},
         ],
     }
+    return apply_positions(graph, positions)
 
 
 def main():
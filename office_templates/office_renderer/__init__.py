@@ -1,6 +1,9 @@
 from .render import render_from_file_stream
 from .pptx.render import render_pptx
 from .pptx.compose import compose_pptx
+from .pptx.layouts import clear_layout_cache
+from .pptx.loops import clear_loop_directive_cache
+from .images import clear_image_directive_cache
 from .xlsx.render import render_xlsx
 from .context_extractor import extract_context_keys
 from .utils import identify_file_type
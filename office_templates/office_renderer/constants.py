@@ -7,6 +7,9 @@ LOOP_KEYWORD = "loop"
 IN_KEYWORD = "in"
 ENDLOOP_KEYWORD = "endloop"
 
+# Layout directive keyword
+LAYOUT_KEYWORD = "layout"
+
 # Image directive keywords
 IMAGE_KEYWORD = "image"
 IMAGESQUEEZE_KEYWORD = "imagesqueeze"
@@ -18,9 +21,14 @@ DIRECTIVE_END = "%"
 # Full directive patterns
 LOOP_START_PATTERN_STR = f"{DIRECTIVE_START}\\s*{LOOP_KEYWORD}\\s+(\\w+)\\s+{IN_KEYWORD}\\s+(.+?)\\s*{DIRECTIVE_END}"
 LOOP_END_PATTERN_STR = f"{DIRECTIVE_START}\\s*{ENDLOOP_KEYWORD}\\s*{DIRECTIVE_END}"
+LAYOUT_PATTERN_STR = f"{DIRECTIVE_START}\\s*{LAYOUT_KEYWORD}\\s+(\\w+)\\s*{DIRECTIVE_END}"
 
 # Image directive patterns
 IMAGE_DIRECTIVES = {
     f"{DIRECTIVE_START}{IMAGE_KEYWORD}{DIRECTIVE_END}": "fit",
     f"{DIRECTIVE_START}{IMAGESQUEEZE_KEYWORD}{DIRECTIVE_END}": "squeeze",
-}
\ No newline at end of file
+}
+
+# URL schemes that image directives may download from (file:// URLs must be
+# enabled separately, see images.ALLOW_FILE_IMAGE_URLS)
+IMAGE_URL_SCHEMES = ("http", "https")
@@ -1,23 +1,58 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
 from urllib.request import urlopen
 
 from openpyxl.drawing.image import Image as XLImage
-from PIL import Image as PILImage
 
 from ..templating import process_text
-from .constants import IMAGE_DIRECTIVES
+from .constants import DIRECTIVE_START, IMAGE_DIRECTIVES, IMAGE_URL_SCHEMES
 from .exceptions import ImageError
+from .pptx.utils import has_text_frame
+
+# Maximum number of concurrent downloads when prefetching images
+IMAGE_DOWNLOAD_WORKERS = 8
+
+# Seconds to wait on an unresponsive image server before giving up
+IMAGE_DOWNLOAD_TIMEOUT = 30
+
+# Whether image directives may read local files through file:// URLs. Off by
+# default: image URLs often come from context data, and a file URL would embed
+# any image readable by the server in the output.
+ALLOW_FILE_IMAGE_URLS = False
+
+# Whether image directive matches are cached by text. Only texts containing
+# the directive marker are cached, up to 4096 of them for the life of the
+# process; set to False to keep document text out of the cache.
+CACHE_IMAGE_DIRECTIVES = True
+
+_MAX_IMAGE_DIRECTIVE_LENGTH = max(len(marker) for marker in IMAGE_DIRECTIVES)
 
 
 def extract_image_directive(text: Optional[str]) -> tuple[Optional[str], Optional[str]]:
-    """Return (url, mode) if *text* starts with an image directive."""
-    if not text:
+    """
+    Return (url, mode) if *text* starts with an image directive.
+
+    Results for texts that may hold a directive are cached by text, as the
+    same strings recur across shapes, slides and cells.
+    """
+    # Most texts are not directives; rule them out before copying the text
+    if not text or DIRECTIVE_START not in text:
         return None, None
-    stripped = text.strip()
-    lowered = stripped.lower()
+    if CACHE_IMAGE_DIRECTIVES:
+        return _match_image_directive(text)
+    return _match_image_directive.__wrapped__(text)
+
+
+@lru_cache(maxsize=4096)
+def _match_image_directive(text: str) -> tuple[Optional[str], Optional[str]]:
+    stripped = text.lstrip()
+    # Only the start of the text can hold a marker, so lowercase just that
+    lowered = stripped[:_MAX_IMAGE_DIRECTIVE_LENGTH].lower()
     for marker, mode in IMAGE_DIRECTIVES.items():
         if lowered.startswith(marker):
             url = stripped[len(marker) :].strip()
@@ -25,15 +60,91 @@ def extract_image_directive(text: Optional[str]) -> tuple[Optional[str], Optiona
     return None, None
 
 
+def clear_image_directive_cache():
+    """Drop all cached image directive matches."""
+    _match_image_directive.cache_clear()
+
+
 def extract_image_url(text: Optional[str]) -> Optional[str]:
     """Backward compatible helper returning only the URL."""
     url, _ = extract_image_directive(text)
     return url
 
 
+def resolve_image_url(
+    url: str,
+    context: dict,
+    check_permissions: Optional[Callable[[object], bool]] = None,
+) -> str:
+    """Resolve any template tags in an image directive's URL."""
+    result = process_text(
+        url,
+        context=context,
+        check_permissions=check_permissions,
+        mode="normal",
+    )
+    assert isinstance(result, str), "Image URL must be a string"
+    return result
+
+
+def download_image(url: str) -> bytes:
+    """Download the image at *url* and return its data."""
+    schemes = IMAGE_URL_SCHEMES + (("file",) if ALLOW_FILE_IMAGE_URLS else ())
+    scheme = urlsplit(url).scheme.lower()
+    if scheme not in schemes:
+        raise ImageError(
+            f"Unsupported image URL '{url}': scheme must be one of {', '.join(schemes)}"
+        )
+
+    try:
+        with urlopen(url, timeout=IMAGE_DOWNLOAD_TIMEOUT) as resp:
+            return resp.read()
+    except Exception as e:  # pragma: no cover - network issues
+        raise ImageError(f"Failed to download image from {url}: {e}")
+
+
+def prefetch_images(urls: Iterable[str]) -> dict[str, bytes | ImageError]:
+    """
+    Download the distinct *urls* concurrently and return a mapping of URL to data.
+
+    URLs that fail to download map to their ImageError, so the download is not
+    retried and the error is raised (and reported against the right shape or
+    cell) when the image is actually placed.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+
+    def fetch(url: str) -> bytes | ImageError:
+        try:
+            return download_image(url)
+        except ImageError as e:
+            return e
+
+    workers = min(IMAGE_DOWNLOAD_WORKERS, len(unique_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_urls, executor.map(fetch, unique_urls)))
+
+
+def get_image_data(
+    url: str, image_cache: Optional[dict[str, bytes | ImageError]] = None
+) -> bytes:
+    """Return the data for *url*, using and filling *image_cache* if given."""
+    if image_cache is not None and url in image_cache:
+        data = image_cache[url]
+        if isinstance(data, ImageError):
+            raise data
+        return data
+
+    data = download_image(url)
+    if image_cache is not None:
+        image_cache[url] = data
+    return data
+
+
 def should_replace_shape_with_image(shape) -> bool:
     """Return True if the shape text indicates an image placeholder."""
-    if not hasattr(shape, "text_frame"):
+    if not has_text_frame(shape):
         return False
     url, _ = extract_image_directive(shape.text_frame.text)
     return url is not None
@@ -54,30 +165,26 @@ def replace_shape_with_image(
     check_permissions: Optional[Callable[[object], bool]] = None,
     url: Optional[str] = None,
     mode: Optional[str] = None,
+    image_cache: Optional[dict[str, bytes | ImageError]] = None,
+    resolved_url: Optional[str] = None,
 ):
-    """Replace *shape* with an image, keeping its position."""
+    """
+    Replace *shape* with an image, keeping its position.
+
+    `resolved_url` may give the directive's URL with its template tags
+    already resolved, in which case they are not resolved again.
+    """
 
     if url is None or mode is None:
-        if not hasattr(shape, "text_frame"):
+        if not has_text_frame(shape):
             return
         url, mode = extract_image_directive(shape.text_frame.text)
     if not url:
         return
 
-    result = process_text(
-        url,
-        context=context,
-        check_permissions=check_permissions,
-        mode="normal",
-    )
-    assert isinstance(result, str), "Image URL must be a string"
-    url = result
-
-    try:
-        with urlopen(url) as resp:
-            data = resp.read()
-    except Exception as e:  # pragma: no cover - network issues
-        raise ImageError(f"Failed to download image from {url}: {e}")
+    if resolved_url is None:
+        resolved_url = resolve_image_url(url, context, check_permissions)
+    data = get_image_data(resolved_url, image_cache)
 
     left = shape.left
     top = shape.top
@@ -85,14 +192,17 @@ def replace_shape_with_image(
     height = shape.height
     rotation = getattr(shape, "rotation", 0)
 
+    # python-pptx interns image parts by SHA1, so repeated images share a
+    # single media part in the saved package
     if mode == "squeeze":
         pic = slide.shapes.add_picture(
             BytesIO(data), left, top, width=width, height=height
         )
     else:
         pic = slide.shapes.add_picture(BytesIO(data), left, top)
-        with PILImage.open(BytesIO(data)) as pil_img:
-            native_w, native_h = pil_img.size
+        # Use the pixel size python-pptx parsed when adding the picture rather
+        # than decoding the image data a second time
+        native_w, native_h = pic.image.size
         w_ratio = width / native_w
         h_ratio = height / native_h
         scale = min(w_ratio, h_ratio)
@@ -103,6 +213,11 @@ def replace_shape_with_image(
 
     pic.rotation = rotation
 
+    # Cache the package's copy of the image rather than the downloaded bytes,
+    # so the download can be freed while later shapes still reuse the image
+    if image_cache is not None:
+        image_cache[resolved_url] = pic.image.blob
+
     # Remove the original shape
     sp_tree = shape._element.getparent()
     sp_tree.remove(shape._element)
@@ -117,6 +232,7 @@ def replace_cell_with_image(
     check_permissions: Optional[Callable[[object], bool]] = None,
     url: Optional[str] = None,
     mode: Optional[str] = None,
+    image_cache: Optional[dict[str, bytes | ImageError]] = None,
 ):
     """Replace the cell's value with an image anchored at the cell."""
 
@@ -127,20 +243,8 @@ def replace_cell_with_image(
     if not url:
         return
 
-    result = process_text(
-        url,
-        context=context,
-        check_permissions=check_permissions,
-        mode="normal",
-    )
-    assert isinstance(result, str), "Image URL must be a string"
-    url = result
-
-    try:
-        with urlopen(url) as resp:
-            data = resp.read()
-    except Exception as e:  # pragma: no cover - network issues
-        raise ImageError(f"Failed to download image from {url}: {e}")
+    url = resolve_image_url(url, context, check_permissions)
+    data = get_image_data(url, image_cache)
 
     img = XLImage(BytesIO(data))
     img.anchor = cell.coordinate
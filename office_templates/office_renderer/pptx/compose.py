@@ -1,12 +1,18 @@
+from collections import ChainMap
 from typing import Callable, Optional
 
 from pptx import Presentation
 
 from office_templates.templating.core import process_text_recursive
 
-from .render import process_single_slide
+from ..utils import ErrorList
+from .render import abort_with_errors, process_single_slide
 from .layouts import build_layout_mapping
-from .utils import copy_slide_across_presentations
+from .utils import (
+    copy_slide_across_presentations,
+    has_text_frame,
+    save_presentation,
+)
 from .graph_processing import process_graph_slide
 
 
@@ -57,7 +63,7 @@ def compose_pptx(
     Returns:
         Tuple of (output, errors) - errors is None if successful, list of errors otherwise
     """
-    errors: list[str] = []
+    errors: ErrorList = ErrorList()
 
     try:
         # Set defaults for optional parameters
@@ -92,13 +98,29 @@ def compose_pptx(
             # Create a blank presentation with default layouts
             base_prs = Presentation()
 
-        # Remove all slides from the base presentation to create a blank deck
+        # Remove all slides from the base presentation to create a blank deck.
+        # Their relationships are dropped too, so the old slide parts are not
+        # written out alongside the new slides.
         sld_ids = base_prs.slides._sldIdLst
-        while len(sld_ids) > 0:
-            slide_id = sld_ids[0]
-            sld_ids.remove(slide_id)
+        prs_rels = base_prs.part.rels
+        for slide_id in sld_ids:
+            prs_rels.pop(slide_id.rId)
+        del sld_ids[:]
+
+        # Layout for slides built from a slide layout: the blank layout if
+        # there is one, otherwise the first available layout
+        slide_layouts = base_prs.slide_layouts
+        if len(slide_layouts) > 6:
+            default_layout = slide_layouts[6]
+        elif len(slide_layouts) > 0:
+            default_layout = slide_layouts[0]
+        else:
+            default_layout = None
 
-        # Create slides from the slide specifications
+        # Create and process slides from the slide specifications. Each slide's
+        # images are downloaded (concurrently) just before it is processed, and
+        # the cache lets later slides reuse images already downloaded.
+        image_cache: dict = {}
         for slide_index, slide_spec in enumerate(slide_specs):
             try:
                 # Validate slide specification
@@ -121,26 +143,30 @@ def compose_pptx(
                     # It's a slide - copy it directly
                     new_slide = copy_slide_across_presentations(base_prs, layout_item)
                 else:
-                    # It's a slide layout - find equivalent layout in base presentation or use blank
-                    if len(base_prs.slide_layouts) > 6:
-                        layout = base_prs.slide_layouts[6]  # Use blank layout
-                    elif len(base_prs.slide_layouts) > 0:
-                        layout = base_prs.slide_layouts[0]  # Use first available layout
-                    else:
+                    # It's a slide layout - use the base presentation's default layout
+                    if default_layout is None:
                         errors.append(
                             f"Slide {slide_index + 1}: No slide layouts available in base presentation"
                         )
                         continue
-                    new_slide = base_prs.slides.add_slide(layout)
+                    new_slide = base_prs.slides.add_slide(default_layout)
 
                 # Process the slide spec in case there are any template variables
-                for key, value in slide_spec.items():
-                    slide_spec[key] = process_text_recursive(
-                        value, global_context, check_permissions
+                # (into a new dict, leaving the caller's spec untouched). The
+                # graph's text is expanded as its nodes and edges are drawn.
+                slide_spec = {
+                    key: (
+                        value
+                        if key == "graph"
+                        else process_text_recursive(
+                            value, global_context, check_permissions
+                        )
                     )
+                    for key, value in slide_spec.items()
+                }
 
-                # Prepare slide context
-                slide_context = {**global_context, **slide_spec}
+                # Prepare slide context, layering the spec over the global context
+                slide_context = ChainMap(slide_spec, global_context)
                 slide_number = slide_index + 1
 
                 # Get placeholders if specified
@@ -155,6 +181,10 @@ def compose_pptx(
                         errors=errors,
                     )
 
+                # Take the slide's shapes before any graph is drawn: the graph's
+                # text is already expanded and must not be processed again
+                shapes = list(new_slide.shapes)
+
                 # Check if this is a graph slide
                 if "graph" in slide_spec:
                     process_graph_slide(
@@ -166,7 +196,7 @@ def compose_pptx(
                         slide_number=slide_number,
                         errors=errors,
                     )
-                
+
                 # Process the slide for template variables
                 process_single_slide(
                     slide=new_slide,
@@ -174,6 +204,8 @@ def compose_pptx(
                     slide_number=slide_number,
                     check_permissions=check_permissions,
                     errors=errors,
+                    image_cache=image_cache,
+                    shapes=shapes,
                 )
 
             except Exception as e:
@@ -181,18 +213,10 @@ def compose_pptx(
 
         # If we have errors, don't save
         if errors:
-            print("Composition aborted due to the following errors:")
-            for err in set(errors):
-                print(f" - {err}")
-            print("Output file not saved.")
-            return None, errors
+            return abort_with_errors(errors, action="Composition")
 
         # Save to output (file path or file-like object)
-        if isinstance(output, str):
-            base_prs.save(output)
-        else:
-            base_prs.save(output)
-            output.seek(0)
+        save_presentation(base_prs, output)
 
         return output, None
 
@@ -211,16 +235,16 @@ def process_placeholders(
 
     placeholder_index = 0
     for shape in slide.shapes:
+        # Stop once every placeholder text has been placed
+        if placeholder_index >= len(placeholders):
+            break
+
         # Check if this shape is a placeholder
-        if (
-            hasattr(shape, "is_placeholder")
-            and shape.is_placeholder
-            and placeholder_index < len(placeholders)
-        ):
+        if getattr(shape, "is_placeholder", False):
             try:
                 # Set the processed text to the shape
                 placeholder_text = placeholders[placeholder_index]
-                if hasattr(shape, "text_frame"):
+                if has_text_frame(shape):
                     shape.text_frame.text = placeholder_text
                 elif hasattr(shape, "text"):
                     shape.text = placeholder_text
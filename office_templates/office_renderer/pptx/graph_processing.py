@@ -5,7 +5,8 @@ This module provides functionality to create node/edge graph visualizations
 on PowerPoint slides, including validation, positioning, and rendering.
 """
 
-from typing import Callable, Optional
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
 
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_CONNECTOR_TYPE
@@ -21,6 +22,41 @@ PIXELS_PER_INCH = 96
 MAX_SLIDE_DIMENSION = 56  # Maximum dimension allowed by PowerPoint
 MIN_SLIDE_DIMENSION = 1  # Minimum dimension allowed by PowerPoint
 
+# Colours of graph nodes, lines and edge labels
+NODE_FILL_COLOR = RGBColor(173, 216, 230)  # Light blue
+LINE_COLOR = RGBColor(0, 0, 0)  # Black
+LABEL_FILL_COLOR = RGBColor(255, 255, 255)  # White
+
+
+class _GraphSizes(NamedTuple):
+    """Node and edge dimensions (in EMU) for one scaling factor."""
+
+    node_width: int
+    node_height: int
+    node_line_width: int
+    name_font_size: int
+    detail_font_size: int
+    edge_line_width: int
+    label_width: int
+    label_height: int
+    label_font_size: int
+
+
+@lru_cache(maxsize=32)
+def _graph_sizes(scale_factor: float) -> _GraphSizes:
+    """Return the node and edge dimensions scaled by *scale_factor*."""
+    return _GraphSizes(
+        node_width=Inches(2.5 * scale_factor),
+        node_height=Inches(1.5 * scale_factor),  # Will auto-expand
+        node_line_width=Pt(1 * scale_factor),
+        name_font_size=Pt(int(14 * scale_factor)),
+        detail_font_size=Pt(int(10 * scale_factor)),
+        edge_line_width=Pt(1.5 * scale_factor),
+        label_width=Inches(1 * scale_factor),
+        label_height=Inches(0.5 * scale_factor),
+        label_font_size=Pt(int(9 * scale_factor)),
+    )
+
 
 def _pixels_to_inches(pixels: float) -> float:
     """
@@ -92,20 +128,25 @@ def process_graph_slide(
         base_prs.slide_width = Inches(slide_width)
         base_prs.slide_height = Inches(slide_height)
 
-        # Create node shapes and store them for edge connections
+        # Expand template text once per distinct string on this slide
+        expand_text = _text_expander(global_context, check_permissions)
+
+        # Create node shapes and store them, with their connection points, for
+        # edge connections
         node_shapes = {}
+        node_points = {}
         for node in nodes:
             shape = _create_node_shape(
                 slide,
                 node,
-                global_context,
-                check_permissions,
+                expand_text,
                 errors,
                 slide_number,
                 scale_factor,
             )
             if shape:
                 node_shapes[node["id"]] = shape
+                node_points[node["id"]] = _connection_points(shape)
 
         # Create edge connectors
         for edge in edges:
@@ -113,8 +154,8 @@ def process_graph_slide(
                 slide,
                 edge,
                 node_shapes,
-                global_context,
-                check_permissions,
+                node_points,
+                expand_text,
                 errors,
                 slide_number,
                 scale_factor,
@@ -124,6 +165,30 @@ def process_graph_slide(
         errors.append(f"Slide {slide_number}: Error processing graph: {e}")
 
 
+def _text_expander(
+    global_context: dict,
+    check_permissions: Optional[Callable[[object], bool]],
+) -> Callable[[object], object]:
+    """
+    Return a function that expands template variables in node and edge text.
+
+    Graphs often repeat the same strings across nodes and edges, so each
+    distinct string is expanded once and the result reused.
+    """
+    expanded: dict[str, object] = {}
+
+    def expand_text(value):
+        if not isinstance(value, str):
+            return process_text_recursive(value, global_context, check_permissions)
+        if value not in expanded:
+            expanded[value] = process_text_recursive(
+                value, global_context, check_permissions
+            )
+        return expanded[value]
+
+    return expand_text
+
+
 def _calculate_slide_dimensions_and_scale(
     nodes: list[dict], errors: list[str], slide_number: int
 ) -> tuple[float, float, float]:
@@ -145,14 +210,14 @@ def _calculate_slide_dimensions_and_scale(
     min_width = 10
     min_height = 7.5
 
-    # Calculate bounds from node positions (in inches, before scaling)
-    max_x = min_width
-    max_y = min_height
-
     # Default node size (will be auto-expanded)
     node_width = 2.5
     node_height = 1.5
 
+    # Gather node positions (in inches, before scaling) as separate x and y
+    # sequences, so each bound is found with a single max()
+    xs = []
+    ys = []
     for node in nodes:
         if "position" not in node:
             errors.append(
@@ -168,15 +233,15 @@ def _calculate_slide_dimensions_and_scale(
             continue
 
         # Convert pixel positions to inches
-        x_inches = _pixels_to_inches(position["x"])
-        y_inches = _pixels_to_inches(position["y"])
+        xs.append(_pixels_to_inches(position["x"]))
+        ys.append(_pixels_to_inches(position["y"]))
 
-        # Calculate right and bottom edges of this node
-        node_right = x_inches + node_width
-        node_bottom = y_inches + node_height
-
-        max_x = max(max_x, node_right + 1)  # Add 1 inch margin
-        max_y = max(max_y, node_bottom + 1)
+    # Calculate right and bottom edges of the furthest nodes (plus 1 inch margin)
+    max_x = min_width
+    max_y = min_height
+    if xs:
+        max_x = max(max_x, max(xs) + node_width + 1)
+        max_y = max(max_y, max(ys) + node_height + 1)
 
     # Calculate scaling factor if dimensions exceed PowerPoint's limits
     scale_factor = 1.0
@@ -196,8 +261,7 @@ def _calculate_slide_dimensions_and_scale(
 def _create_node_shape(
     slide,
     node: dict,
-    global_context: dict,
-    check_permissions: Optional[Callable[[object], bool]],
+    expand_text: Callable[[object], object],
     errors: list[str],
     slide_number: int,
     scale_factor: float = 1.0,
@@ -208,8 +272,7 @@ def _create_node_shape(
     Args:
         slide: The slide to add the shape to
         node: Node dictionary with position and content
-        global_context: Global context for template processing
-        check_permissions: Permission checking function
+        expand_text: Function expanding template variables in node text
         errors: List to append errors to
         slide_number: Slide number for error reporting
         scale_factor: Scaling factor to apply to positions and fonts
@@ -243,26 +306,26 @@ def _create_node_shape(
             return None
 
         # Process template variables in node name and detail
-        name = process_text_recursive(node["name"], global_context, check_permissions)
+        name = expand_text(node["name"])
         detail = ""
         if "detail" in node:
-            detail = process_text_recursive(
-                node["detail"], global_context, check_permissions
-            )
+            detail = expand_text(node["detail"])
 
-        # Convert pixel positions to inches and apply scaling
+        # Convert pixel positions to inches and apply scaling; sizes are
+        # scaled too
+        sizes = _graph_sizes(scale_factor)
         left = Inches(_pixels_to_inches(position["x"]) * scale_factor)
         top = Inches(_pixels_to_inches(position["y"]) * scale_factor)
-        width = Inches(2.5 * scale_factor)  # Default width, scaled
-        height = Inches(1.5 * scale_factor)  # Default height, will auto-expand, scaled
 
-        shape = slide.shapes.add_shape(1, left, top, width, height)  # MSO_SHAPE.RECTANGLE
+        shape = slide.shapes.add_shape(
+            1, left, top, sizes.node_width, sizes.node_height
+        )  # MSO_SHAPE.RECTANGLE
 
         # Configure shape appearance
         shape.fill.solid()
-        shape.fill.fore_color.rgb = RGBColor(173, 216, 230)  # Light blue
-        shape.line.color.rgb = RGBColor(0, 0, 0)  # Black border
-        shape.line.width = Pt(1 * scale_factor)
+        shape.fill.fore_color.rgb = NODE_FILL_COLOR
+        shape.line.color.rgb = LINE_COLOR
+        shape.line.width = sizes.node_line_width
 
         # Add text to shape
         text_frame = shape.text_frame
@@ -272,14 +335,14 @@ def _create_node_shape(
         # Add name (larger font) - font size scales with the graph
         p = text_frame.paragraphs[0]
         p.text = name
-        p.font.size = Pt(int(14 * scale_factor))
+        p.font.size = sizes.name_font_size
         p.font.bold = True
 
         # Add detail if present (smaller font) - font size scales with the graph
         if detail:
             p = text_frame.add_paragraph()
             p.text = detail
-            p.font.size = Pt(int(10 * scale_factor))
+            p.font.size = sizes.detail_font_size
 
         # Enable auto-fit
         text_frame.auto_size = 1  # MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
@@ -299,12 +362,30 @@ def _create_node_shape(
         return None
 
 
+def _connection_points(shape) -> tuple[int, int, int]:
+    """
+    Return the (left, right, middle) connection coordinates of a node shape.
+
+    Edges leave a node from the middle of its right edge and enter from the
+    middle of its left edge; the coordinates are in EMU.
+
+    Args:
+        shape: The node shape
+
+    Returns:
+        Tuple of (left x, right x, middle y)
+    """
+    left = shape.left
+    top = shape.top
+    return left, left + shape.width, top + shape.height // 2
+
+
 def _create_edge_connector(
     slide,
     edge: dict,
     node_shapes: dict,
-    global_context: dict,
-    check_permissions: Optional[Callable[[object], bool]],
+    node_points: dict,
+    expand_text: Callable[[object], object],
     errors: list[str],
     slide_number: int,
     scale_factor: float = 1.0,
@@ -316,8 +397,8 @@ def _create_edge_connector(
         slide: The slide to add the connector to
         edge: Edge dictionary with from/to node IDs
         node_shapes: Dictionary of node shapes by ID
-        global_context: Global context for template processing
-        check_permissions: Permission checking function
+        node_points: Dictionary of node connection points by ID
+        expand_text: Function expanding template variables in the label
         errors: List to append errors to
         slide_number: Slide number for error reporting
         scale_factor: Scaling factor to apply to line widths and fonts
@@ -353,14 +434,16 @@ def _create_edge_connector(
 
         from_shape = node_shapes[from_id]
         to_shape = node_shapes[to_id]
+        _, from_right, from_middle = node_points[from_id]
+        to_left, _, to_middle = node_points[to_id]
 
         # Create elbow connector (right angles)
         connector = slide.shapes.add_connector(
             MSO_CONNECTOR_TYPE.ELBOW,
-            from_shape.left + from_shape.width,  # Right edge of source
-            from_shape.top + from_shape.height // 2,  # Middle of source
-            to_shape.left,  # Left edge of target
-            to_shape.top + to_shape.height // 2,  # Middle of target
+            from_right,  # Right edge of source
+            from_middle,  # Middle of source
+            to_left,  # Left edge of target
+            to_middle,  # Middle of target
         )
 
         # Connect to shapes
@@ -368,31 +451,32 @@ def _create_edge_connector(
         connector.end_connect(to_shape, 1)  # Left connection point
 
         # Style the connector - line width scales with the graph
-        connector.line.color.rgb = RGBColor(0, 0, 0)  # Black line
-        connector.line.width = Pt(1.5 * scale_factor)
+        sizes = _graph_sizes(scale_factor)
+        connector.line.color.rgb = LINE_COLOR
+        connector.line.width = sizes.edge_line_width
 
         # Add label if present
         if "label" in edge and edge["label"]:
-            label_text = process_text_recursive(
-                edge["label"], global_context, check_permissions
-            )
+            label_text = expand_text(edge["label"])
 
             # Add text box for label near the middle of the connector
-            mid_x = (connector.begin_x + connector.end_x) // 2
-            mid_y = (connector.begin_y + connector.end_y) // 2
+            # (from the end points given to add_connector, not read back from
+            # the connector's XML)
+            mid_x = (from_right + to_left) // 2
+            mid_y = (from_middle + to_middle) // 2
 
             # Label box dimensions scale with the graph
             label_box = slide.shapes.add_textbox(
-                mid_x - Inches(0.5 * scale_factor),
-                mid_y - Inches(0.25 * scale_factor),
-                Inches(1 * scale_factor),
-                Inches(0.5 * scale_factor),
+                mid_x - sizes.label_width // 2,
+                mid_y - sizes.label_height // 2,
+                sizes.label_width,
+                sizes.label_height,
             )
 
             label_box.text_frame.text = label_text
-            label_box.text_frame.paragraphs[0].font.size = Pt(int(9 * scale_factor))
+            label_box.text_frame.paragraphs[0].font.size = sizes.label_font_size
             label_box.fill.solid()
-            label_box.fill.fore_color.rgb = RGBColor(255, 255, 255)  # White background
+            label_box.fill.fore_color.rgb = LABEL_FILL_COLOR
 
         return connector
 
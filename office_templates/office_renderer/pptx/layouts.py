@@ -1,8 +1,27 @@
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from pptx import Presentation
-from .utils import remove_shape
-from .loops import is_loop_start, is_loop_end
+from .utils import remove_shape, shape_text
+from .loops import is_loop_directive
+from ..constants import DIRECTIVE_START, LAYOUT_KEYWORD, LAYOUT_PATTERN_STR
 from ..exceptions import LayoutError
 
+# Pattern for layout directives
+LAYOUT_PATTERN = re.compile(LAYOUT_PATTERN_STR, re.IGNORECASE)
+
+# Maximum number of template files loaded concurrently
+LAYOUT_LOAD_WORKERS = 8
+
+# Number of template layout mappings kept between compositions (0 disables
+# the cache)
+LAYOUT_CACHE_SIZE = 16
+_LAYOUT_CACHE: dict[tuple, dict] = {}
+_LAYOUT_CACHE_LOCK = threading.Lock()
+
 
 def build_layout_mapping(
     template_files,
@@ -31,38 +50,121 @@ def build_layout_mapping(
             layout_mapping[layout_id] = (prs, layout)
         return layout_mapping
 
-    for template_file in template_files:
-        # Load presentation
-        if isinstance(template_file, str):
-            prs = Presentation(template_file)
-        else:
-            template_file.seek(0)
-            prs = Presentation(template_file)
-
-        # Get master layouts
-        master_layouts = get_master_layouts(prs)
-        for layout_id, layout in master_layouts.items():
-            layout_mapping[layout_id] = (prs, layout)
+    def load(template_file):
+        return load_template_layouts(
+            template_file,
+            use_tagged_layouts=use_tagged_layouts,
+            use_all_slides_as_layouts_by_title=use_all_slides_as_layouts_by_title,
+        )
+
+    # Load the templates concurrently (unzipping and XML parsing release the
+    # GIL), then merge them in order so later templates override earlier ones.
+    # A file object listed twice is loaded once, as loading seeks and reads it.
+    unique_files = list({_template_id(f): f for f in template_files}.values())
+    if len(unique_files) > 1:
+        workers = min(LAYOUT_LOAD_WORKERS, len(unique_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(load, unique_files))
+    else:
+        loaded = [load(template_file) for template_file in unique_files]
+    template_layouts = {
+        _template_id(f): layouts for f, layouts in zip(unique_files, loaded)
+    }
 
-        # Get tagged layouts if enabled
-        if use_tagged_layouts:
-            try:
-                tagged_layouts = get_tagged_layouts(prs)
-                for layout_id, slide in tagged_layouts.items():
-                    layout_mapping[layout_id] = (prs, slide)
-            except LayoutError as e:
-                # Re-raise validation errors to let the caller handle them
-                raise e
-
-        # Get title layouts if enabled
-        if use_all_slides_as_layouts_by_title:
-            title_layouts = get_title_layouts(prs)
-            for layout_id, slide in title_layouts.items():
-                layout_mapping[layout_id] = (prs, slide)
+    for template_file in template_files:
+        layout_mapping.update(template_layouts[_template_id(template_file)])
 
     return layout_mapping
 
 
+def load_template_layouts(
+    template_file,
+    use_tagged_layouts=False,
+    use_all_slides_as_layouts_by_title=False,
+):
+    """
+    Build the layout mapping of a single template file.
+
+    Loading a template parses the whole package, so mappings are cached by
+    the file's path and modification time (or, for file-like objects, a hash
+    of the content) together with the layout options. The cached layouts are
+    only read from: composed slides copy their shapes, charts and images.
+    Each call returns a new dict, so callers may change it freely. Call
+    clear_layout_cache() to release the cached layouts, or set
+    LAYOUT_CACHE_SIZE to 0 to turn caching off.
+
+    Returns:
+        dict: Mapping of layout ID (str) to (presentation, slide) tuple
+    """
+    cache_key = (
+        _template_cache_key(template_file),
+        use_tagged_layouts,
+        use_all_slides_as_layouts_by_title,
+    )
+    with _LAYOUT_CACHE_LOCK:
+        layout_mapping = _LAYOUT_CACHE.get(cache_key)
+    if layout_mapping is not None:
+        return dict(layout_mapping)
+
+    # Load presentation
+    if isinstance(template_file, str):
+        prs = Presentation(template_file)
+    else:
+        template_file.seek(0)
+        prs = Presentation(template_file)
+
+    layout_mapping = {}
+
+    # Get master layouts
+    master_layouts = get_master_layouts(prs)
+    for layout_id, layout in master_layouts.items():
+        layout_mapping[layout_id] = (prs, layout)
+
+    # Get tagged layouts if enabled (validation errors are left to the caller)
+    if use_tagged_layouts:
+        tagged_layouts = get_tagged_layouts(prs)
+        for layout_id, slide in tagged_layouts.items():
+            layout_mapping[layout_id] = (prs, slide)
+
+    # Get title layouts if enabled
+    if use_all_slides_as_layouts_by_title:
+        title_layouts = get_title_layouts(prs)
+        for layout_id, slide in title_layouts.items():
+            layout_mapping[layout_id] = (prs, slide)
+
+    # Keep the cache bounded, dropping the oldest entries first
+    if LAYOUT_CACHE_SIZE > 0:
+        with _LAYOUT_CACHE_LOCK:
+            while len(_LAYOUT_CACHE) >= LAYOUT_CACHE_SIZE:
+                del _LAYOUT_CACHE[next(iter(_LAYOUT_CACHE))]
+            _LAYOUT_CACHE[cache_key] = layout_mapping
+
+    return dict(layout_mapping)
+
+
+def clear_layout_cache():
+    """Drop all cached template layout mappings (and their presentations)."""
+    with _LAYOUT_CACHE_LOCK:
+        _LAYOUT_CACHE.clear()
+
+
+def _template_cache_key(template_file):
+    """Return a key identifying the current content of a template file."""
+    if isinstance(template_file, str):
+        stat = os.stat(template_file)
+        return os.path.abspath(template_file), stat.st_mtime_ns, stat.st_size
+
+    template_file.seek(0)
+    return hashlib.blake2b(template_file.read(), digest_size=16).digest()
+
+
+def _template_id(template_file):
+    """Return a key telling template entries apart: paths by value, files by identity."""
+    if isinstance(template_file, str):
+        return template_file
+    return id(template_file)
+
+
 def get_master_layouts(prs):
     """Get master layout slides where ID is the layout name."""
     layouts = {}
@@ -78,10 +180,7 @@ def get_master_layouts(prs):
 
 def get_tagged_layouts(prs):
     """Get slides that have shapes with % layout XXX % tags."""
-    import re
-
     layouts = {}
-    pattern = re.compile(r"%\s*layout\s+(\w+)\s*%", re.IGNORECASE)
 
     for slide in prs.slides:
         layout_shapes = []
@@ -89,17 +188,25 @@ def get_tagged_layouts(prs):
 
         # First pass: find all %layout% shapes and check for conflicts
         for shape in slide.shapes:
-            if hasattr(shape, "text_frame") and hasattr(shape.text_frame, "text"):
-                text = shape.text_frame.text.strip()
-                match = pattern.search(text)
-                if match:
-                    layout_shapes.append(shape)
-                    if layout_id is None:
-                        layout_id = match.group(1)
-                    elif layout_id != match.group(1):
-                        raise LayoutError(
-                            f"Multiple different layout IDs found on same slide: '{layout_id}' and '{match.group(1)}'"
-                        )
+            text = shape_text(shape)
+            # Skip the regex for shapes without text, and for the many shapes
+            # without a directive marker or the (case-insensitive) layout keyword
+            if (
+                text is None
+                or DIRECTIVE_START not in text
+                or LAYOUT_KEYWORD not in text.lower()
+            ):
+                continue
+            match = LAYOUT_PATTERN.search(text)
+            if match:
+                layout_shapes.append(shape)
+                if layout_id is None:
+                    layout_id = match.group(1)
+                elif layout_id != match.group(1):
+                    raise LayoutError(
+                        "Multiple different layout IDs found on same slide: "
+                        f"'{layout_id}' and '{match.group(1)}'"
+                    )
 
         # Validate: only one %layout% shape per slide
         if len(layout_shapes) > 1:
@@ -108,9 +215,10 @@ def get_tagged_layouts(prs):
         # If we found a layout, validate no loop directives on this slide
         if layout_id is not None:
             for shape in slide.shapes:
-                if is_loop_start(shape) or is_loop_end(shape):
+                if is_loop_directive(shape):
                     raise LayoutError(
-                        f"Slide with %layout% cannot contain %loop% or %endloop% directives"
+                        "Slide with %layout% cannot contain %loop% or %endloop% "
+                        "directives"
                     )
 
             # Remove the %layout% shape
@@ -127,12 +235,14 @@ def get_title_layouts(prs):
     layouts = {}
 
     for slide in prs.slides:
-        # Find the title shape (usually the first shape or a shape with specific placeholder type)
+        # Find the title shape (usually the first shape or a shape with specific
+        # placeholder type)
         title = None
         for shape in slide.shapes:
-            if hasattr(shape, "text_frame") and hasattr(shape.text_frame, "text"):
+            text = shape_text(shape)
+            if text is not None:
                 # Use the first text shape as title
-                title = shape.text_frame.text.strip()
+                title = text.strip()
                 break
 
         if title:
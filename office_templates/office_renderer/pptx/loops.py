@@ -5,16 +5,22 @@ Functions to handle loop functionality in PPTX templates.
 from __future__ import annotations
 
 import re
+from collections.abc import Sized
+from functools import lru_cache
 from typing import TYPE_CHECKING, Callable, Iterable, Optional, Any
 
 from office_templates.templating import resolve_tag
 from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.oxml.ns import qn
 
 from ..constants import (
+    DIRECTIVE_START,
+    ENDLOOP_KEYWORD,
+    LOOP_KEYWORD,
     LOOP_START_PATTERN_STR,
     LOOP_END_PATTERN_STR,
 )
-from .utils import duplicate_slide, remove_shape
+from .utils import duplicate_slide, remove_shape, shape_text
 
 if TYPE_CHECKING:
     from pptx.presentation import Presentation
@@ -23,13 +29,33 @@ if TYPE_CHECKING:
 LOOP_START_PATTERN = re.compile(LOOP_START_PATTERN_STR)
 LOOP_END_PATTERN = re.compile(LOOP_END_PATTERN_STR)
 
+# Whether loop directive matches are cached by text. Only texts containing a
+# directive marker are cached, up to 4096 of them for the life of the
+# process; set to False to keep document text out of the cache.
+CACHE_LOOP_DIRECTIVES = True
+
 
 def extract_loop_directive(text: str | None) -> tuple[str | None, str | None]:
-    """Return (variable, collection) if *text* contains a loop directive."""
-    if not text:
+    """
+    Return (variable, collection) if *text* contains a loop directive.
+
+    Results for texts that may hold a directive are cached by text, as the
+    same strings recur across slides.
+    """
+    # Directive keywords are matched case-sensitively, so a substring test
+    # rules out most texts before the regex runs
+    if not text or LOOP_KEYWORD not in text:
         return None, None
+    if CACHE_LOOP_DIRECTIVES:
+        return _match_loop_start(text)
+    return _match_loop_start.__wrapped__(text)
 
-    match = LOOP_START_PATTERN.search(text.strip())
+
+@lru_cache(maxsize=4096)
+def _match_loop_start(text: str) -> tuple[str | None, str | None]:
+    # The pattern starts with a directive marker, so surrounding whitespace
+    # never affects the search and the text need not be stripped first
+    match = LOOP_START_PATTERN.search(text)
     if match:
         variable = match.group(1)
         collection = match.group(2)
@@ -38,54 +64,81 @@ def extract_loop_directive(text: str | None) -> tuple[str | None, str | None]:
     return None, None
 
 
-def _check_shape_for_loop_directive(shape, pattern) -> bool:
+def classify_loop_text(text: str | None) -> tuple[str | None, str | None, bool]:
     """
-    Recursively check a shape (including grouped shapes) for loop directives.
-    
+    Return (variable, collection, is_end) for the loop directives in *text*.
+
+    Results for texts that may hold a directive are cached by text, so each
+    such text is only matched against the directive patterns once however
+    many shapes or passes it appears in.
+    """
+    # Most shapes hold no directive at all; a substring test is far cheaper
+    # than running the directive regexes
+    if not text or DIRECTIVE_START not in text:
+        return None, None, False
+    if CACHE_LOOP_DIRECTIVES:
+        return _classify_directive_text(text)
+    return _classify_directive_text.__wrapped__(text)
+
+
+@lru_cache(maxsize=4096)
+def _classify_directive_text(text: str) -> tuple[str | None, str | None, bool]:
+    variable, collection = extract_loop_directive(text)
+    is_end = ENDLOOP_KEYWORD in text and LOOP_END_PATTERN.search(text) is not None
+    return variable, collection, is_end
+
+
+def clear_loop_directive_cache():
+    """Drop all cached loop directive matches."""
+    _match_loop_start.cache_clear()
+    _classify_directive_text.cache_clear()
+
+
+def classify_loop_shape(shape) -> tuple[str | None, str | None, bool]:
+    """
+    Classify a shape's loop directives in a single pass over its text.
+
+    Grouped shapes are checked recursively: the first loop start found among
+    the sub-shapes is returned, and the shape counts as a loop end if any
+    sub-shape is one.
+
     Args:
-        shape: Shape to check
-        pattern: Regex pattern to match
-        
+        shape: Shape to classify
+
     Returns:
-        True if the pattern is found in the shape or its sub-shapes
+        Tuple of (variable, collection, is_end); variable and collection are
+        None if the shape has no loop start directive
     """
     # Handle grouped shapes recursively
     if hasattr(shape, "shape_type") and shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+        variable, collection, is_end = None, None, False
         for grouped_shape in shape.shapes:
-            if _check_shape_for_loop_directive(grouped_shape, pattern):
-                return True
-        return False
-    
-    # Check individual shape
-    if not hasattr(shape, "text_frame") or not hasattr(shape.text_frame, "text"):
-        return False
+            sub_variable, sub_collection, sub_is_end = classify_loop_shape(grouped_shape)
+            if variable is None and sub_variable is not None:
+                variable, collection = sub_variable, sub_collection
+            is_end = is_end or sub_is_end
+        return variable, collection, is_end
 
-    text = shape.text_frame.text
-    if not text:
-        return False
-
-    return pattern.search(text.strip()) is not None
+    # Check individual shape
+    return classify_loop_text(shape_text(shape))
 
 
 def is_loop_start(shape) -> bool:
     """Return True if the shape text indicates a loop start."""
-    # Handle grouped shapes recursively
-    if hasattr(shape, "shape_type") and shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-        for grouped_shape in shape.shapes:
-            if is_loop_start(grouped_shape):
-                return True
-        return False
-    
-    if not hasattr(shape, "text_frame") or not hasattr(shape.text_frame, "text"):
-        return False
-
-    variable, collection = extract_loop_directive(shape.text_frame.text)
+    variable, collection, _ = classify_loop_shape(shape)
     return variable is not None and collection is not None
 
 
 def is_loop_end(shape) -> bool:
     """Return True if the shape text indicates a loop end."""
-    return _check_shape_for_loop_directive(shape, LOOP_END_PATTERN)
+    _, _, is_end = classify_loop_shape(shape)
+    return is_end
+
+
+def is_loop_directive(shape) -> bool:
+    """Return True if the shape text indicates a loop start or a loop end."""
+    variable, collection, is_end = classify_loop_shape(shape)
+    return is_end or (variable is not None and collection is not None)
 
 
 def get_collection_from_collection_tag(
@@ -115,11 +168,15 @@ def get_collection_from_collection_tag(
     if collection is None:
         return None, f"Collection '{collection_tag}' not found in context"
 
-    # Ensure the collection is iterable (force evaluation of any lazy iterables)
+    # Ensure the collection is iterable. Sized collections (eg lists or querysets)
+    # are used as they are; other iterables (eg generators) are evaluated once
+    # here so that they can be counted and iterated
     try:
-        collection = list(collection)
+        iterator = iter(collection)
     except TypeError:
         return None, f"'{collection_tag}' is not a collection of things"
+    if not isinstance(collection, Sized):
+        collection = list(iterator)
 
     # For empty or nonexistent collections
     if not collection:
@@ -135,29 +192,40 @@ def process_loops(
     errors: list[str],
 ):
     """
-    Process loops in the presentation:
+    Process loops in the presentation in a single pass over the slides:
     - Identify loop sections (slides between %loop var in collection% and %endloop%)
-    - For each item in the collection, create a mapping between loop slides and variables
+    - As each section closes, repeat its slides for each item in the collection,
+      adding the loop variables to their context
     - Return a list of slides to process with their context info
     """
 
-    # First pass: identify loop sections and collect info about them
-    slide_sections = []
+    # Single pass: identify loop sections and expand each one as soon as its
+    # %endloop% is reached. Duplicated slides are inserted into the deck as we
+    # go, so walk a snapshot of the original slides.
+    slides_to_process = []
     in_loop = False
     loop_variable_name = None
     loop_collection = None
     loop_slides = []
 
-    for i, slide in enumerate(prs.slides):
+    # Loops over the same collection share one resolution (the context is the
+    # same for every loop section)
+    resolved_collections: dict[str, tuple[Optional[Iterable[Any]], Optional[str]]] = {}
+
+    for i, slide in enumerate(list(prs.slides)):
         # Track whether this slide has loop directives
         has_loop_start = False
         has_loop_end = False
         loop_start_shapes = []
         loop_end_shapes = []
 
-        for shape in slide.shapes:
+        # Classify every shape once; the directive shapes are removed below,
+        # so take a snapshot rather than iterating the live shape tree
+        shape_info = [(shape, *classify_loop_shape(shape)) for shape in slide.shapes]
+
+        for shape, variable_name, collection_tag, shape_is_end in shape_info:
             # Check for loop start
-            if is_loop_start(shape):
+            if variable_name is not None and collection_tag is not None:
                 # Store the shape, but delete it from the slide
                 loop_start_shapes.append(shape)
                 remove_shape(shape)
@@ -170,23 +238,21 @@ def process_loops(
                     return []
 
                 # Get the loop variable and collection data
-                loop_variable_name, collection_tag = extract_loop_directive(
-                    shape.text_frame.text
-                )
-                if loop_variable_name and collection_tag:
-                    has_loop_start = True
-                    loop_collection, error = get_collection_from_collection_tag(
-                        collection_tag, context, check_permissions
+                loop_variable_name = variable_name
+                has_loop_start = True
+                if collection_tag not in resolved_collections:
+                    resolved_collections[collection_tag] = (
+                        get_collection_from_collection_tag(
+                            collection_tag, context, check_permissions
+                        )
                     )
-                    if error:
-                        errors.append(f"Error on slide {i + 1}: {error}")
-                        return []
-                else:
-                    errors.append(f"Error on slide {i + 1}: Invalid loop start directive")
+                loop_collection, error = resolved_collections[collection_tag]
+                if error:
+                    errors.append(f"Error on slide {i + 1}: {error}")
                     return []
 
             # Check for loop end
-            if is_loop_end(shape):
+            if shape_is_end:
                 # Store the shape, but delete it from the slide
                 loop_end_shapes.append(shape)
                 remove_shape(shape)
@@ -220,20 +286,16 @@ def process_loops(
 
             # Handle loop end
             if has_loop_end:
-                # Quit if loop end directives there are on the slide
-                loop_end_count = sum(1 for shape in slide.shapes if is_loop_end(shape))
-                if loop_end_count > 1:
-                    errors.append(
-                        f"Error on slide {i + 1}: Multiple loop end directives on same slide"
+                # Expand the loop (incl duplication and extra loop context)
+                assert loop_collection is not None
+                slides_to_process.extend(
+                    expand_loop_slides(
+                        prs,
+                        slides=loop_slides,
+                        loop_variable_name=loop_variable_name,
+                        loop_collection=loop_collection,
+                        first_slide_number=len(slides_to_process) + 1,
                     )
-                    return []
-
-                slide_sections.append(
-                    {
-                        "slides": loop_slides,
-                        "loop_variable_name": loop_variable_name,
-                        "loop_collection": loop_collection,
-                    }
                 )
 
                 # Reset loop state
@@ -244,106 +306,67 @@ def process_loops(
 
         # Non-loop slides
         else:
-            slide_sections.append(
+            slides_to_process.append(
                 {
-                    "slides": [slide],
+                    "slide": slide,
+                    "slide_number": len(slides_to_process) + 1,
                 }
             )
 
-        # # Handle loop slides
-        # if in_loop:
-        #     # For each item in the collection, process each slide
-        #     assert collection
-        #     for loop_item in collection:
-        #         # Add the loop variable to the context for this slide
-        #         extra_context = {loop_variable_name: loop_item}
-        #         for j in range(section["start_index"], section["end_index"] + 1):
-        #             # Duplicate the slide scenarios
-        #             new_slide = duplicate_slide(prs, j)
-        #             # Store the new slide in the list
-        #             slides_to_process.append(
-        #                 {
-        #                     "slide": new_slide,
-        #                     "slide_number": current_slide_number,
-        #                     "extra_context": extra_context,
-        #                 }
-        #             )
-        #             current_slide_number += 1
-
-        # # Handle non-loop slides
-        # else:
-        #     slides_to_process.append(
-        #         {
-        #             "slide": slide,
-        #             "slide_number": current_slide_number,
-        #         }
-        #     )
-        #     current_slide_number += 1
-
     # Check for unclosed loops
     if in_loop:
         errors.append(f"Error: Loop started but never closed with %endloop%")
         return []  # Short-circuit when unclosed loop found
 
-    # Keep track of which slides are part of loops to avoid duplicating them
-    # loop_slide_indices = set()
-    # for section in slide_sections:
-    #     for i in range(section["start_index"], section["end_index"] + 1):
-    #         loop_slide_indices.add(i)
+    return slides_to_process
 
-    # Prepare slides to process
-    slides_to_process = []
-    current_slide_number = 1
-
-    # Create the slide structure (incl duplication and extra loop context)
-    for section in slide_sections:
-        loop_variable_name = section.get("loop_variable_name", None)
-        loop_collection = section.get("loop_collection", None)
-        slides = section.get("slides")
-
-        # Not in loop
-        if not loop_variable_name:
-            for slide in slides:
-                slides_to_process.append(
-                    {
-                        "slide": slide,
-                        "slide_number": current_slide_number,
-                    }
-                )
-                current_slide_number += 1
 
-        # In loop
-        else:
-            assert loop_collection is not None
-
-            # For each item in the collection, process each slide
-            loop_count = len(loop_collection)
-            for i, loop_item in enumerate(loop_collection):
-                # Add the loop variable to the context for this slide
-                extra_context = {
-                    section["loop_variable_name"]: loop_item,
-                    "loop_count": loop_count,
+def expand_loop_slides(
+    prs: Presentation,
+    slides: list,
+    loop_variable_name: str,
+    loop_collection: Iterable[Any],
+    first_slide_number: int,
+) -> list[dict]:
+    """
+    Repeat the slides of a loop section once per item in the collection.
+
+    The original slides are used for the first item and duplicates (placed
+    right after the previous repetition) for the rest. Returns the slides to
+    process, numbered from *first_slide_number*, with the loop variables in
+    their extra context.
+    """
+    slides_to_process = []
+    current_slide_number = first_slide_number
+
+    # For each item in the collection, process each slide
+    loop_count = len(loop_collection)
+    for i, loop_item in enumerate(loop_collection):
+        # Add the loop variable to the context for this slide
+        extra_context = {
+            loop_variable_name: loop_item,
+            "loop_count": loop_count,
+        }
+        for slide in slides:
+            # Duplicate the slide, or (if this is first loop item) use the original
+            if i == 0:
+                new_slide = slide
+            else:
+                # Current slide number is 1-indexed
+                new_slide_index = current_slide_number - 1
+                new_slide = duplicate_slide(prs, slide, new_slide_index)
+            # Store the new slide in the list
+            slides_to_process.append(
+                {
+                    "slide": new_slide,
+                    "slide_number": current_slide_number,
+                    "extra_context": {
+                        **extra_context,
+                        "loop_number": i + 1,
+                    },
                 }
-                for slide in slides:
-                    # Duplicate the slide, or (if this is first loop item) use the original
-                    if i == 0:
-                        new_slide = slide
-                    else:
-                        # Current slide number is 1-indexed
-                        new_slide_index = current_slide_number - 1
-                        new_slide = duplicate_slide(prs, slide, new_slide_index)
-                    # Store the new slide in the list
-                    slides_to_process.append(
-                        {
-                            "slide": new_slide,
-                            "slide_number": current_slide_number,
-                            "extra_context": {
-                                **extra_context,
-                                "loop_number": i + 1,
-                            },
-                        }
-                    )
-                    current_slide_number += 1
+            )
+            current_slide_number += 1
 
     return slides_to_process
 
@@ -361,17 +384,14 @@ def _clear_loop_directives_from_shape(shape):
             _clear_loop_directives_from_shape(grouped_shape)
         return
     
-    # Process individual shape
-    if hasattr(shape, "text_frame") and hasattr(shape.text_frame, "text"):
-        text = shape.text_frame.text.strip()
-        if LOOP_START_PATTERN.search(text) or LOOP_END_PATTERN.search(text):
-            # Clear text at paragraph level to handle formatting
-            for paragraph in shape.text_frame.paragraphs:
-                if paragraph.runs:
-                    for run in paragraph.runs:
-                        run.text = ""
-                else:
-                    paragraph.text = ""
+    # Process individual shape: one cached classification of its text (which
+    # rules out text without a directive marker) instead of two pattern searches
+    variable, _, is_end = classify_loop_text(shape_text(shape))
+    if variable is not None or is_end:
+        # Empty every text element in one pass over the text body, keeping the
+        # runs (and so their formatting) in place
+        for text_element in shape.text_frame._txBody.iter(qn("a:t")):
+            text_element.text = ""
 
 
 def clear_loop_directives(prs):
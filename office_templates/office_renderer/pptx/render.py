@@ -1,20 +1,21 @@
+from collections import ChainMap
 from typing import IO, Callable, Optional
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
 from ..charts import process_chart
 from ..images import (
+    extract_image_directive,
+    prefetch_images,
     replace_shape_with_image,
+    resolve_image_url,
     should_replace_shape_with_image,
 )
 from ..paragraphs import process_paragraph
 from ..tables import process_table_cell
-from .loops import (
-    is_loop_end,
-    is_loop_start,
-    process_loops,
-)
-from .utils import remove_shape
+from ..utils import ErrorList
+from .loops import classify_loop_text, process_loops
+from .utils import has_text_frame, remove_shape, save_presentation
 
 
 def render_pptx(
@@ -22,10 +23,15 @@ def render_pptx(
     context: dict,
     output: str | IO[bytes],
     check_permissions: Optional[Callable[[object], bool]],
+    fail_fast: bool = True,
 ):
     """
     Render the PPTX template (a path string or a file-like object) using the provided context and save to output.
     'output' can be a path string or a file-like object. If it's a file-like object, it will be rewound after saving.
+
+    The output is only saved when rendering succeeds, so by default rendering
+    stops at the first error, and the images of later slides are not
+    downloaded. Pass fail_fast=False to collect every error.
     """
     # Support template as a file path or file-like object.
     if isinstance(template, str):
@@ -34,7 +40,7 @@ def render_pptx(
         template.seek(0)
         prs = Presentation(template)
 
-    errors: list[str] = []
+    errors: ErrorList = ErrorList()
 
     # Process loops first - identify loop sections and duplicate slides
     slides_to_process = process_loops(
@@ -43,65 +49,93 @@ def render_pptx(
         check_permissions=check_permissions,
         errors=errors,
     )
+    if errors and fail_fast:
+        return abort_with_errors(errors)
+
+    # Images are downloaded slide by slide, just before each slide is
+    # processed; the cache lets later slides reuse images already downloaded
+    image_cache: dict = {}
 
-    # Process all slides including duplicated ones from loops
+    # Process all slides, including those duplicated by loops
     for slide_info in slides_to_process:
-        slide = slide_info["slide"]
         slide_number = slide_info.get("slide_number", 0)
         extra_context = slide_info.get("extra_context", {})
 
-        # Create slide context (include `extra_context`, which is where loop variables are)
-        slide_context = {
-            **context,
-            **extra_context,
-            "slide_number": slide_number,
-        }
+        # Layer the slide-specific values (including `extra_context`, which is
+        # where loop variables are) over the shared context rather than copying it
+        slide_values = {**extra_context, "slide_number": slide_number}
 
         # Add loop variable to context if present
         if "loop_var" in slide_info and "loop_item" in slide_info:
-            slide_context[slide_info["loop_var"]] = slide_info["loop_item"]
+            slide_values[slide_info["loop_var"]] = slide_info["loop_item"]
 
         # Process the slide
         process_single_slide(
-            slide=slide,
-            context=slide_context,
+            slide=slide_info["slide"],
+            context=ChainMap(slide_values, context),
             slide_number=slide_number,
             check_permissions=check_permissions,
             errors=errors,
+            image_cache=image_cache,
+            fail_fast=fail_fast,
         )
+        if errors and fail_fast:
+            break
 
     if errors:
-        print("Rendering aborted due to the following errors:")
-        for err in set(errors):
-            print(f" - {err}")
-        print("Output file not saved.")
-        return None, errors
+        return abort_with_errors(errors)
 
     # Save to output (file path or file-like object)
-    if isinstance(output, str):
-        prs.save(output)
-    else:
-        prs.save(output)
-        output.seek(0)
+    save_presentation(prs, output)
 
     return output, None
 
 
+def abort_with_errors(errors: list[str], action: str = "Rendering"):
+    """Report the errors that stopped *action* and return the failed result."""
+    # Report each distinct error once, in the order it occurred, in a single
+    # write. An ErrorList already holds each message once.
+    distinct = errors if isinstance(errors, ErrorList) else dict.fromkeys(errors)
+    lines = [f"{action} aborted due to the following errors:"]
+    lines.extend(f" - {err}" for err in distinct)
+    omitted = getattr(errors, "omitted", 0)
+    if omitted:
+        lines.append(f" - ... and {omitted} more errors")
+    lines.append("Output file not saved.")
+    print("\n".join(lines))
+    return None, errors
+
+
 def process_single_slide(
     slide,
     context: dict,
     slide_number: int,
     check_permissions: Optional[Callable[[object], bool]],
     errors: list[str],
+    image_cache: Optional[dict] = None,
+    fail_fast: bool = False,
+    shapes: Optional[list] = None,
 ):
-    """Process a single slide with the given context."""
-    # Process the slide's shapes
-    for shape in slide.shapes:
-        # Skip loop directive shapes - we'll clear them later
-        if is_loop_start(shape) or is_loop_end(shape):
-            continue
-
-        # Process the shape content
+    """
+    Process a single slide with the given context.
+
+    The slide's images are resolved and downloaded (concurrently) before its
+    shapes are processed; `image_cache` maps URLs to data already downloaded
+    and is filled in as the slide's images are placed.
+
+    With fail_fast, processing stops after the first shape that reports an error.
+    `shapes` may pass in a list of the slide's shapes already taken by the caller.
+    """
+    # Process the slide's shapes. Take the list once up front: image
+    # replacement adds and removes shapes, and the pictures it adds need no
+    # further processing. Each shape's text is read and classified once in
+    # process_shape_content, which also removes any loop directive shapes.
+    if shapes is None:
+        shapes = list(slide.shapes)
+    if image_cache is None:
+        image_cache = {}
+    image_urls = prepare_images(shapes, context, check_permissions, image_cache)
+    for shape in shapes:
         process_shape_content(
             shape,
             slide=slide,
@@ -109,7 +143,58 @@ def process_single_slide(
             slide_number=slide_number,
             check_permissions=check_permissions,
             errors=errors,
+            image_cache=image_cache,
+            image_urls=image_urls,
+        )
+        if errors and fail_fast:
+            return
+
+
+def prepare_images(
+    shapes,
+    context: dict,
+    check_permissions: Optional[Callable[[object], bool]],
+    image_cache: dict,
+) -> dict:
+    """
+    Resolve the URL of every image directive among *shapes* and download them.
+
+    Each directive's URL is resolved once, here, and the same URL is used to
+    place the image, so tag callables and permission checks run once per
+    shape. URLs not yet in *image_cache* are downloaded concurrently and added
+    to it (failed downloads as their error, so they are not retried).
+
+    Returns:
+        dict: Shape element to resolved URL, or to the exception raised while
+        resolving it (reported when the shape itself is processed)
+    """
+    image_urls = {}
+    for shape in _iter_image_shapes(shapes):
+        url, _ = extract_image_directive(shape.text_frame.text)
+        try:
+            image_urls[shape._element] = resolve_image_url(
+                url, context, check_permissions
+            )
+        except Exception as e:
+            image_urls[shape._element] = e
+
+    image_cache.update(
+        prefetch_images(
+            url
+            for url in image_urls.values()
+            if isinstance(url, str) and url not in image_cache
         )
+    )
+    return image_urls
+
+
+def _iter_image_shapes(shapes):
+    """Yield the shapes among *shapes* (and within groups) with an image directive."""
+    for shape in shapes:
+        if hasattr(shape, "shape_type") and shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _iter_image_shapes(shape.shapes)
+        elif should_replace_shape_with_image(shape):
+            yield shape
 
 
 def process_shape_content(
@@ -119,8 +204,15 @@ def process_shape_content(
     slide_number: int,
     check_permissions: Optional[Callable[[object], bool]],
     errors: list[str],
+    image_cache: Optional[dict] = None,
+    image_urls: Optional[dict] = None,
 ):
-    """Process the content of a shape based on its type."""
+    """
+    Process the content of a shape based on its type.
+
+    `image_urls` may map shape elements to image URLs already resolved by
+    prepare_images (or to the error raised resolving them).
+    """
     # 0) Check if this is a grouped shape and process recursively.
     if hasattr(shape, "shape_type") and shape.shape_type == MSO_SHAPE_TYPE.GROUP:
         for grouped_shape in shape.shapes:
@@ -131,30 +223,47 @@ def process_shape_content(
                 slide_number=slide_number,
                 check_permissions=check_permissions,
                 errors=errors,
+                image_cache=image_cache,
+                image_urls=image_urls,
             )
         return
 
-    # 1) Check if this shape should be replaced with an image.
-    if should_replace_shape_with_image(shape):
-        try:
-            replace_shape_with_image(
-                shape,
-                slide,
-                context=context,
-                check_permissions=check_permissions,
-            )
-        except Exception as e:
-            errors.append(f"Error processing image (slide {slide_number}): {e}")
-        # Skip further processing for this shape.
-        return
+    # 1-3) Shapes with a text frame: image directives, loop directives and text.
+    #      (python-pptx shapes with a text frame are never tables or charts.)
+    if has_text_frame(shape):
+        text = shape.text_frame.text
 
-    # 2) Check if this shape should be removed (because it's a loop directive).
-    if is_loop_start(shape) or is_loop_end(shape):
-        remove_shape(shape)
-        return
+        # 1) Check if this shape should be replaced with an image.
+        url, mode = extract_image_directive(text)
+        if url:
+            try:
+                resolved_url = image_urls.get(shape._element) if image_urls else None
+                if isinstance(resolved_url, Exception):
+                    raise resolved_url
+                replace_shape_with_image(
+                    shape,
+                    slide,
+                    context=context,
+                    check_permissions=check_permissions,
+                    url=url,
+                    mode=mode,
+                    image_cache=image_cache,
+                    resolved_url=resolved_url,
+                )
+            except Exception as e:
+                errors.append(f"Error processing image (slide {slide_number}): {e}")
+            # Skip further processing for this shape.
+            return
 
-    # 3) Process text frames (non-table).
-    if hasattr(shape, "text_frame"):
+        # 2) Check if this shape should be removed (because it's a loop directive).
+        variable, collection, is_end = classify_loop_text(text)
+        if is_end or (variable is not None and collection is not None):
+            remove_shape(shape)
+            return
+
+        # 3) Process text frames (non-table). Static text needs no processing.
+        if "{{" not in text:
+            return
         for paragraph in shape.text_frame.paragraphs:
             # Merge any placeholders that are split across multiple runs.
             try:
@@ -166,6 +275,7 @@ def process_shape_content(
                 )
             except Exception as e:
                 errors.append(f"Error in paragraph (slide {slide_number}): {e}")
+        return
 
     # 4) Process tables.
     if getattr(shape, "has_table", False):
@@ -6,13 +6,33 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
+import hashlib
+import re
 from copy import deepcopy
+from io import BytesIO
+from weakref import WeakKeyDictionary
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import XmlPart
+from pptx.oxml.ns import nsuri, qn
 
 if TYPE_CHECKING:
     from pptx.presentation import Presentation
     from pptx.slide import Slide
     from pptx.shapes.base import BaseShape
 
+# Namespace prefix of relationship-id attributes such as r:embed and r:id
+_R_NAMESPACE = "{%s}" % nsuri("r")
+
+# Trailing number of a part name, e.g. the 3 in /ppt/charts/chart3.xml
+_PARTNAME_NUMBER = re.compile(r"\d*(\.\w+)$")
+
+# Image parts of each destination package by SHA1, see _image_index()
+_IMAGE_INDEXES: WeakKeyDictionary = WeakKeyDictionary()
+
+# Whether instances of each shape class expose a text frame
+_HAS_TEXT_FRAME: dict[type, bool] = {}
+
 
 def duplicate_slide(
     pres: Presentation,
@@ -38,27 +58,23 @@ def duplicate_slide(
     new_slide = pres.slides.add_slide(slide.slide_layout)
 
     #  (2) Calculate where the duplicate should live
+    #      (only look up the original's position when it is needed, as
+    #      that scans the whole slide list)
     sld_ids = pres.slides._sldIdLst
-    src_idx = pres.slides.index(slide)  # position of original
-    dest_idx = (
-        len(sld_ids) + index
-        if index is not None and index < 0  # negative slice logic
-        else index if index is not None else src_idx + 1
-    )
+    if index is None:
+        dest_idx = pres.slides.index(slide) + 1  # right after the original
+    elif index < 0:
+        dest_idx = len(sld_ids) + index  # negative slice logic
+    else:
+        dest_idx = index
     dest_idx = max(0, min(dest_idx, len(sld_ids) - 1))  # clamp to bounds
 
     # (3) Move the slide-id element to that position
     new_sld_id = sld_ids[-1]  # id for slide we just appended
     sld_ids.remove(new_sld_id)
     sld_ids.insert(dest_idx, new_sld_id)
-    # Delete all the shapes in the new slide
-    for shape in new_slide.shapes:
-        remove_shape(shape)
-
-    # Deep-copy all shapes from the source slide to the new slide
-    for shape in slide.shapes:
-        new_el = deepcopy(shape.element)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
+    # Replace the new slide's shapes with copies of the source slide's shapes
+    clone_shapes(slide, new_slide)
 
     return new_slide
 
@@ -108,18 +124,212 @@ def copy_slide_across_presentations(
         dest_idx = max(0, min(dest_idx, len(sld_ids)))  # clamp to bounds
         sld_ids.insert(dest_idx, new_sld_id)
     
-    # Clear the default shapes from the new slide
-    for shape in list(new_slide.shapes):
-        remove_shape(shape)
-    
-    # Deep-copy all shapes from the source slide to the new slide
-    for shape in source_slide.shapes:
-        new_el = deepcopy(shape.element)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
+    # Replace the default shapes with copies of the source slide's shapes
+    clone_shapes(source_slide, new_slide)
     
     return new_slide
 
 
+def clone_shapes(source_slide: Slide, dest_slide: Slide):
+    """
+    Replace the shapes on *dest_slide* with deep copies of those on *source_slide*.
+
+    Works directly on the shape tree XML: the existing shapes are removed
+    without building shape proxies and the copies are inserted in one batch
+    ahead of any extension list. Relationships used by the copied shapes
+    (pictures, charts, hyperlinks) are recreated on the destination slide.
+
+    Args:
+        source_slide: The slide whose shapes are copied
+        dest_slide: The slide whose shapes are replaced
+    """
+    dest_tree = dest_slide.shapes._spTree
+    for shape_el in list(dest_tree.iter_shape_elms()):
+        dest_tree.remove(shape_el)
+
+    new_elements = [deepcopy(shape.element) for shape in source_slide.shapes]
+    if source_slide.part is not dest_slide.part:
+        _relink_elements(new_elements, source_slide.part, dest_slide.part)
+
+    ext_lst = dest_tree.find(qn("p:extLst"))
+    if ext_lst is not None:
+        for new_el in new_elements:
+            ext_lst.addprevious(new_el)
+    else:
+        dest_tree.extend(new_elements)
+
+
+def _relink_elements(elements, source_part, dest_part):
+    """
+    Point the relationship ids in *elements* at relationships of *dest_part*.
+
+    Each relationship referenced from the copied XML is added to the
+    destination part and the attribute is rewritten to the new id, so copied
+    pictures and charts resolve on the new slide. See _relationship_target
+    for which targets are shared and which are copied.
+    """
+    rid_map: dict[str, Optional[str]] = {}
+    for element in elements:
+        for node in element.iter():
+            for attr, rId in node.attrib.items():
+                if not attr.startswith(_R_NAMESPACE):
+                    continue
+                if rId not in rid_map:
+                    rid_map[rId] = _relink(rId, source_part, dest_part)
+                new_rId = rid_map[rId]
+                if new_rId is None:
+                    # The reference cannot be carried over; drop it rather than
+                    # leave an id that may name another relationship of dest_part
+                    del node.attrib[attr]
+                else:
+                    node.set(attr, new_rId)
+
+
+def _relink(rId, source_part, dest_part) -> Optional[str]:
+    """
+    Relate *dest_part* to the target of *source_part*'s relationship *rId*.
+
+    Returns the new relationship id, or None if the relationship does not
+    exist or its target cannot be carried over to the destination package.
+    """
+    rel = source_part.rels.get(rId)
+    if rel is None:
+        return None
+    if rel.is_external:
+        return dest_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+    target = _relationship_target(rel, dest_part)
+    if target is None:
+        return None
+    return dest_part.relate_to(target, rel.reltype)
+
+
+def _relationship_target(rel, dest_part):
+    """
+    Return the part that *dest_part* should relate to in place of *rel*'s target.
+
+    - Charts and their embedded workbooks are copied, as rendering replaces
+      their data and each copy must be independent of the original.
+    - Images are shared within a package; across packages they are copied
+      as-is (SVG and other formats included) unless the destination package
+      already holds an identical image.
+    - Other parts are shared within a package and dropped (None) across
+      packages, since their part names may clash with the destination's own
+      parts.
+    """
+    target = rel.target_part
+    package = dest_part.package
+    if rel.reltype in (RT.CHART, RT.PACKAGE):
+        return _copy_part(target, package)
+    if target.package is package:
+        return target
+    if rel.reltype == RT.IMAGE:
+        images = _image_index(package)
+        sha1 = hashlib.sha1(target.blob).hexdigest()
+        if sha1 not in images:
+            images[sha1] = _copy_part(target, package)
+        return images[sha1]
+    return None
+
+
+def _image_index(package) -> dict[str, object]:
+    """
+    Return the SHA1-to-image-part index used to share copied images in *package*.
+
+    The index is built from the package's image parts on first use and then
+    kept up to date as images are copied in, so each image is hashed once
+    however many slides are copied.
+    """
+    images = _IMAGE_INDEXES.get(package)
+    if images is None:
+        images = _IMAGE_INDEXES[package] = {}
+        for rel in package.iter_rels():
+            if not rel.is_external and rel.reltype == RT.IMAGE:
+                part = rel.target_part
+                images.setdefault(hashlib.sha1(part.blob).hexdigest(), part)
+    return images
+
+
+def _copy_part(part, package):
+    """Add a copy of *part*, and the parts its XML refers to, to *package*."""
+    # Number the copy like the original, e.g. /ppt/charts/chart%d.xml
+    partname = package.next_partname(_PARTNAME_NUMBER.sub(r"%d\1", part.partname))
+    new_part = type(part).load(partname, part.content_type, package, part.blob)
+    if isinstance(new_part, XmlPart):
+        _relink_elements([new_part._element], part, new_part)
+    return new_part
+
+
+def has_text_frame(shape: BaseShape) -> bool:
+    """
+    Return True if the shape has a text frame.
+
+    python-pptx decides this by shape class (autoshapes and placeholders have
+    one, pictures, connectors, groups and graphic frames do not), so the
+    answer is cached per class instead of probing every shape with hasattr.
+    """
+    shape_class = type(shape)
+    result = _HAS_TEXT_FRAME.get(shape_class)
+    if result is None:
+        result = _HAS_TEXT_FRAME[shape_class] = hasattr(shape, "text_frame")
+    return result
+
+
+def shape_text(shape: BaseShape) -> Optional[str]:
+    """
+    Return the text of the shape's text frame, or None if it has none.
+
+    The text frame is only accessed once; shapes without one are ruled out by
+    the per-class has_text_frame check.
+    """
+    if not has_text_frame(shape):
+        return None
+    try:
+        return shape.text_frame.text
+    except AttributeError:
+        return None
+
+
+def save_presentation(prs: Presentation, output):
+    """
+    Save the presentation to a path or file-like object.
+
+    Paths, real files and in-memory buffers are saved to directly. Any other
+    stream (a socket, response or remote object store stream) gets the
+    package in a single write, rather than the many small writes zipfile
+    makes. Seekable file-like output is rewound after saving.
+    """
+    if isinstance(output, str):
+        prs.save(output)
+        return
+
+    seekable = _is_seekable(output)
+    if isinstance(output, BytesIO) or (seekable and _is_real_file(output)):
+        prs.save(output)
+    else:
+        buffer = BytesIO()
+        prs.save(buffer)
+        output.write(buffer.getvalue())
+    if seekable:
+        output.seek(0)
+
+
+def _is_seekable(stream) -> bool:
+    """Return True if *stream* supports seeking back to its start."""
+    try:
+        return stream.seekable()
+    except AttributeError:
+        return hasattr(stream, "seek")
+
+
+def _is_real_file(stream) -> bool:
+    """Return True if *stream* is backed by an operating system file."""
+    try:
+        stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
+
+
 def remove_shape(shape: BaseShape):
     """
     Remove a shape from a slide.
@@ -24,6 +24,10 @@ def process_table_cell(
 
     cell_text = cell.text.strip()
 
+    # Most cells hold static text; leave them untouched
+    if "{{" not in cell_text:
+        return
+
     matches = get_matching_tags(cell_text)
 
     # Process in "table" mode if exactly one tag is found.
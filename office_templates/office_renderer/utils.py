@@ -91,3 +91,39 @@ def identify_file_type(file_input: str | IO[bytes]):
     raise UnsupportedFileType(
         "Unsupported file type. Please provide a valid XLSX or PPTX file."
     )
+
+
+# Maximum number of distinct error messages an ErrorList keeps
+MAX_ERRORS = 1000
+
+
+class ErrorList(list):
+    """
+    List of error messages that ignores repeated messages.
+
+    Messages are collected with append() and extend(), which drop duplicates as
+    they are added, so a batch with many identical failures stays small and
+    keeps its first-seen order. At most `max_errors` distinct messages are
+    kept; `omitted` counts the distinct messages dropped beyond that. The other
+    list methods are inherited unchanged and do not deduplicate.
+    """
+
+    def __init__(self, errors=(), max_errors: int = MAX_ERRORS):
+        super().__init__()
+        self._seen: set[str] = set()
+        self.max_errors = max_errors
+        self.omitted = 0
+        self.extend(errors)
+
+    def append(self, error: str) -> None:
+        if error in self._seen:
+            return
+        self._seen.add(error)
+        if len(self) >= self.max_errors:
+            self.omitted += 1
+            return
+        super().append(error)
+
+    def extend(self, errors) -> None:
+        for error in errors:
+            self.append(error)
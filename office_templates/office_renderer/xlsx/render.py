@@ -1,6 +1,6 @@
 from typing import IO, Callable, Optional
 
-from ..utils import get_load_workbook
+from ..utils import ErrorList, get_load_workbook
 from .worksheets import process_worksheet
 
 
@@ -33,7 +33,7 @@ def render_xlsx(
         template.seek(0)
         workbook = load_workbook(template)
 
-    errors = []
+    errors: ErrorList = ErrorList()
 
     # Process each worksheet in the workbook
     for sheet_name in workbook.sheetnames:
@@ -57,8 +57,10 @@ def render_xlsx(
 
     if errors:
         print("Rendering aborted due to the following errors:")
-        for err in set(errors):
+        for err in errors:
             print(f" - {err}")
+        if errors.omitted:
+            print(f" - ... and {errors.omitted} more errors")
         print("Output file not saved.")
         return None, errors
 
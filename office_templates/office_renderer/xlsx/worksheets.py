@@ -26,6 +26,11 @@ def process_worksheet(
     # Process column by column, THEN each element (row) of the column.
     for col in worksheet.iter_cols():
         for cell_idx, cell in enumerate(col):
+            # Only text can hold placeholders or image directives; empty cells,
+            # numbers and dates come back from processing unchanged
+            if not isinstance(cell.value, str):
+                continue
+
             # If this cell contains an image directive, replace it and skip further processing.
             if should_replace_cell_with_image(cell):
                 replace_cell_with_image(
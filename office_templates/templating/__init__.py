@@ -1,4 +1,4 @@
-from .core import process_text, get_matching_tags
+from .core import process_text, get_matching_tags, clear_tag_cache
 from .resolve import resolve_tag, split_expression, resolve_segment
 from .parse import get_nested_attr, evaluate_condition, parse_value
 from .formatting import convert_date_format
@@ -10,15 +10,52 @@ Permission checking is enforced during parsing.
 """
 
 import re
+from functools import lru_cache
 from typing import Callable, Optional
 
 from .exceptions import BadTemplateModeError, EmptyDataException
 from .resolve import resolve_formatted_tag
 
 
+TAG_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+
+
 def get_matching_tags(text: str):
-    pattern = re.compile(r"\{\{(.*?)\}\}")
-    return list(pattern.finditer(text))
+    return list(TAG_PATTERN.finditer(text))
+
+
+# Whether parsed tags are cached by text. The cache keeps up to 4096 template
+# strings alive for the life of the process; set to False to keep document
+# text out of it, or call clear_tag_cache() to release it.
+CACHE_PARSED_TAGS = True
+
+
+def parse_tags(text: str) -> tuple[tuple[int, int, str], ...]:
+    """
+    Return (start, end, expression) for each tag in *text*.
+
+    Parsing depends only on the text, and the same template strings recur on
+    every slide or row generated from a loop, so results for texts holding a
+    tag are cached by text.
+    """
+    # Most strings hold no tags; skip parsing them (and caching them) entirely
+    if "{{" not in text:
+        return ()
+    if CACHE_PARSED_TAGS:
+        return _parse_tags(text)
+    return _parse_tags.__wrapped__(text)
+
+
+@lru_cache(maxsize=4096)
+def _parse_tags(text: str) -> tuple[tuple[int, int, str], ...]:
+    return tuple(
+        (m.start(), m.end(), m.group(1).strip()) for m in TAG_PATTERN.finditer(text)
+    )
+
+
+def clear_tag_cache():
+    """Drop all cached tag parses."""
+    _parse_tags.cache_clear()
 
 
 def process_text(
@@ -41,7 +78,7 @@ def process_text(
     a list of strings is returned, where each string is the original text with that tag replaced
     by one of the list items. Otherwise, the tag is replaced inline.
     """
-    matches = get_matching_tags(text)
+    matches = parse_tags(text)
 
     # For table mode, ensure exactly one tag is present.
     if mode == "table" and len(matches) != 1:
@@ -57,14 +94,10 @@ def process_text(
     # with its processed value.
     result_parts = []
     last_index = 0
-    for m in matches:
-        start, end = m.span()
+    for start, end, raw_expr in matches:
         before = text[last_index:start]
         result_parts.append(before)
 
-        # Raw match.
-        raw_expr = m.group(1).strip()
-
         # Process the actual tag expression.
         value = resolve_formatted_tag(
             expr=raw_expr,
@@ -1,4 +1,5 @@
 import re
+from collections.abc import Mapping
 
 
 def get_nested_attr(obj, attr):
@@ -31,7 +32,7 @@ def get_nested_attr(obj, attr):
                 pass
         
         # Normal attribute/dictionary access
-        if isinstance(obj, dict):
+        if isinstance(obj, Mapping):
             obj = obj[part]
         else:
             obj = getattr(obj, part)
@@ -1,5 +1,7 @@
 import re
 import datetime
+from collections.abc import Mapping
+from itertools import islice
 from typing import Callable, Optional
 
 from .exceptions import BadTagException, MissingDataException, TagCallableException
@@ -9,6 +11,9 @@ from .permissions import enforce_permissions
 
 BAD_SEGMENT_PATTERN = re.compile(r"^[#%]*$")
 
+# Keys listed when a missing-data error describes a mapping
+_DESCRIBE_MAX_KEYS = 10
+
 
 def resolve_formatted_tag(
     expr: str,
@@ -246,8 +251,10 @@ def resolve_tag(
         return datetime.datetime.now()
 
     current = context
-    for seg in segments:
-        current = resolve_segment(current, seg, check_permissions=check_permissions)
+    for i, seg in enumerate(segments):
+        current = resolve_segment(
+            current, seg, check_permissions=check_permissions, is_context=(i == 0)
+        )
         if current is None:
             return ""
     return current
@@ -274,6 +281,7 @@ def resolve_segment(
     current,
     segment,
     check_permissions: Optional[Callable[[object], bool]] = None,
+    is_context: bool = False,
 ):
     """
     Resolve a single segment of a dotted tag expression.
@@ -294,6 +302,8 @@ def resolve_segment(
       current: The current object (or list of objects) being resolved.
       segment (str): The individual segment to resolve.
       check_permissions: The permission checking function for enforcement.
+      is_context (bool): Whether *current* is the template context itself, which only
+        affects how it is described in error messages.
 
     Returns:
       The value obtained after resolving the segment. If the segment leads to a list and further resolution is required,
@@ -346,7 +356,9 @@ def resolve_segment(
     try:
         value = get_nested_attr(current, attr_name)
     except (AttributeError, KeyError) as e:
-        raise MissingDataException(f"{segment} not found in {current}")
+        raise MissingDataException(
+            f"{segment} not found in {_describe(current, is_context)}"
+        )
 
     # If the segment indicates that this attribute is callable (with optional arguments), call it.
     if call_args_str is not None:
@@ -393,3 +405,22 @@ def resolve_segment(
     # Enforce permissions on the filtered result.
     value = enforce_permissions(value, check_permissions)
     return value
+
+
+def _describe(current, is_context: bool = False) -> str:
+    """
+    Describe the object a tag segment was looked up in, for error messages.
+
+    The context (which may be a ChainMap of layered contexts) and other mappings
+    are described by the first few of their keys, so the message neither exposes
+    how the context is built nor dumps its values.
+    """
+    if not isinstance(current, Mapping):
+        return str(current)
+
+    keys = [str(key) for key in islice(current, _DESCRIBE_MAX_KEYS)]
+    if len(current) > _DESCRIBE_MAX_KEYS:
+        keys.append(f"... {len(current) - _DESCRIBE_MAX_KEYS} more")
+    if is_context:
+        return f"context (available keys: {', '.join(keys)})"
+    return f"{type(current).__name__} with keys: {', '.join(keys)}"
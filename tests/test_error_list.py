@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import patch
+
+from office_templates.office_renderer.pptx.render import abort_with_errors
+from office_templates.office_renderer.utils import ErrorList
+
+
+class TestErrorList(unittest.TestCase):
+    def test_append_and_extend_drop_duplicates(self):
+        errors = ErrorList(["a", "b", "a"])
+        errors.append("b")
+        errors.extend(["c", "a"])
+        self.assertEqual(errors, ["a", "b", "c"])
+
+    def test_cap(self):
+        errors = ErrorList(max_errors=2)
+        errors.extend(["a", "b", "c", "d", "c"])
+        errors.append("e")
+        self.assertEqual(errors, ["a", "b"])
+        self.assertEqual(errors.omitted, 3)
+
+    def test_abort_report_counts_omitted_errors(self):
+        errors = ErrorList(["a", "b", "c"], max_errors=2)
+        with patch("builtins.print") as mock_print:
+            abort_with_errors(errors)
+        report = mock_print.call_args.args[0]
+        self.assertIn(" - b\n - ... and 1 more errors\n", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,13 @@
 import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from pptx import Presentation
 from pptx.util import Inches
 
 from office_templates.office_renderer import compose_pptx
+from office_templates.office_renderer.pptx import graph_processing
 
 
 class TestGraphsUnit(unittest.TestCase):
@@ -236,6 +238,54 @@ class TestGraphsUnit(unittest.TestCase):
 
         self.assertTrue(found_company, "Template variable should be processed")
 
+    def test_node_text_expanded_only_once(self):
+        """Expanded node text is not expanded a second time."""
+        self.context["snippet"] = "{{ company }}"
+        slide_specs = [
+            {
+                "layout": "graph",
+                "graph": {
+                    "nodes": [
+                        {
+                            "id": "test",
+                            "name": "Example: {{ snippet }}",
+                            "position": {"x": 1, "y": 1},
+                        },
+                    ],
+                    "edges": [],
+                },
+            }
+        ]
+
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template_path],
+            slide_specs=slide_specs,
+            global_context=self.context,
+            output=output_file,
+            use_tagged_layouts=True,
+        )
+        self.assertIsNone(errors)
+
+        slide = Presentation(output_file).slides[0]
+        texts = [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+        self.assertIn("Example: {{ company }}", texts)
+
+    def test_repeated_node_text_expanded_once(self):
+        """Strings repeated across a graph are only expanded once."""
+        expand_text = graph_processing._text_expander(self.context, None)
+        with patch.object(
+            graph_processing,
+            "process_text_recursive",
+            wraps=graph_processing.process_text_recursive,
+        ) as mock_process:
+            names = [expand_text("{{ company }}") for _ in range(3)]
+
+        self.assertEqual(names, ["Test Corp"] * 3)
+        self.assertEqual(mock_process.call_count, 1)
+
     def test_edge_label_processing(self):
         """Test that edge labels with template variables are processed."""
         slide_specs = [
@@ -300,6 +350,27 @@ class TestGraphsUnit(unittest.TestCase):
         self.assertIsNotNone(errors)
         self.assertTrue(any("missing 'position'" in error for error in errors))
 
+    def test_repeated_errors_reported_once(self):
+        """Identical validation failures are collected only once."""
+        nodes = [{"id": "bad_node", "name": "Bad Node"} for _ in range(50)]
+        slide_specs = [{"layout": "graph", "graph": {"nodes": nodes, "edges": []}}]
+
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template_path],
+            slide_specs=slide_specs,
+            global_context=self.context,
+            output=output_file,
+            use_tagged_layouts=True,
+        )
+
+        self.assertIsNone(result)
+        # 50 identical nodes produce each distinct message once
+        self.assertEqual(len(errors), len(set(errors)))
+        self.assertLess(len(errors), 5)
+
     def test_node_without_id_error(self):
         """Test error handling when node is missing id."""
         slide_specs = [
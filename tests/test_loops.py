@@ -5,8 +5,15 @@ from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches
 
+from office_templates.templating import resolve_tag
+from office_templates.office_renderer.pptx import loops
 from office_templates.office_renderer.pptx.loops import (
+    classify_loop_shape,
+    classify_loop_text,
+    clear_loop_directives,
     extract_loop_directive,
+    get_collection_from_collection_tag,
+    is_loop_directive,
     is_loop_end,
     is_loop_start,
     process_loops,
@@ -60,6 +67,24 @@ class TestLoopDirectives(unittest.TestCase):
         self.assertIsNone(variable)
         self.assertIsNone(collection)
 
+    def test_loop_directive_cache(self):
+        """Only texts holding a directive are cached, and caching can be turned off."""
+        loops.clear_loop_directive_cache()
+        classify_loop_text("Plain text from the document")
+        classify_loop_text("%loop user in users%")
+        self.assertEqual(loops._classify_directive_text.cache_info().currsize, 1)
+
+        loops.clear_loop_directive_cache()
+        with patch.object(loops, "CACHE_LOOP_DIRECTIVES", False):
+            self.assertEqual(
+                classify_loop_text("%loop user in users%"), ("user", "users", False)
+            )
+            self.assertEqual(
+                extract_loop_directive("%loop user in users%"), ("user", "users")
+            )
+        self.assertEqual(loops._classify_directive_text.cache_info().currsize, 0)
+        self.assertEqual(loops._match_loop_start.cache_info().currsize, 0)
+
     def test_is_loop_start(self):
         """Test the detection of loop start directive."""
         # Valid loop start
@@ -104,6 +129,49 @@ class TestLoopDirectives(unittest.TestCase):
         shape_with_empty_text_frame.text_frame = text_frame_without_text
         self.assertFalse(is_loop_end(shape_with_empty_text_frame))
 
+    def test_classify_loop_shape(self):
+        """Test that a shape is classified as loop start and/or end in one call."""
+        self.textbox.text_frame.text = "%loop user in users%"
+        self.assertEqual(classify_loop_shape(self.textbox), ("user", "users", False))
+
+        self.textbox.text_frame.text = "% endloop %"
+        self.assertEqual(classify_loop_shape(self.textbox), (None, None, True))
+
+        self.textbox.text_frame.text = "%loop user in users% %endloop%"
+        self.assertEqual(classify_loop_shape(self.textbox), ("user", "users", True))
+
+        self.textbox.text_frame.text = "Plain text"
+        self.assertEqual(classify_loop_shape(self.textbox), (None, None, False))
+
+        shape_without_text_frame = MagicMock(spec=[])
+        self.assertEqual(
+            classify_loop_shape(shape_without_text_frame), (None, None, False)
+        )
+
+    def test_is_loop_directive(self):
+        """Test the detection of either loop directive."""
+        for text in ["%loop user in users%", "%endloop%"]:
+            self.textbox.text_frame.text = text
+            self.assertTrue(is_loop_directive(self.textbox))
+
+        self.textbox.text_frame.text = "%loop invalid%"
+        self.assertFalse(is_loop_directive(self.textbox))
+
+    def test_clear_loop_directives(self):
+        """Directive text is cleared; other text is left alone."""
+        self.textbox.text_frame.text = "%loop user in users%"
+        other = self.slide.shapes.add_textbox(Inches(1), Inches(3), Inches(2), Inches(1))
+        other.text_frame.text = "100% {{ user.name }}"
+
+        self.textbox.text_frame.paragraphs[0].runs[0].font.bold = True
+
+        clear_loop_directives(self.prs)
+
+        # The run is emptied but kept, with its formatting
+        self.assertEqual(self.textbox.text_frame.text, "")
+        self.assertTrue(self.textbox.text_frame.paragraphs[0].runs[0].font.bold)
+        self.assertEqual(other.text_frame.text, "100% {{ user.name }}")
+
     def test_regex_patterns(self):
         """Test that the regex patterns handle spaces correctly."""
         # Test LOOP_START_PATTERN
@@ -198,6 +266,24 @@ class TestLoopProcessing(unittest.TestCase):
         # Last normal slide
         self.assertEqual(result[7]["slide_number"], 8)
 
+    def test_process_loops_resolves_shared_collection_once(self):
+        """Two loops over the same collection should resolve it only once."""
+        for directive in ["%loop user in users%", "%loop other in users%"]:
+            slide = self.prs.slides.add_slide(self.prs.slide_layouts[5])
+            for top, text in [(Inches(1), directive), (Inches(2), "%endloop%")]:
+                box = slide.shapes.add_textbox(Inches(1), top, Inches(3), Inches(0.5))
+                box.text_frame.text = text
+
+        with patch(
+            "office_templates.office_renderer.pptx.loops.resolve_tag",
+            wraps=resolve_tag,
+        ) as mock_resolve_tag:
+            result = process_loops(self.prs, self.context, None, self.errors)
+
+        self.assertEqual(self.errors, [])
+        self.assertEqual(len(result), 4)
+        mock_resolve_tag.assert_called_once()
+
     def test_process_loops_dot_notation(self):
         """Test process_loops with dot notation for the collection."""
         # Create a presentation with 3 slides (start, content, end)
@@ -415,6 +501,29 @@ class TestLoopProcessing(unittest.TestCase):
         self.assertIsNone(variable)
         self.assertIsNone(collection)
 
+    def test_get_collection_from_collection_tag(self):
+        """Sized collections are used as-is; other iterables are evaluated."""
+        collection, error = get_collection_from_collection_tag(
+            "users", self.context, None
+        )
+        self.assertIsNone(error)
+        self.assertIs(collection, self.context["users"])
+
+        context = {"numbers": (n for n in range(3))}
+        collection, error = get_collection_from_collection_tag("numbers", context, None)
+        self.assertIsNone(error)
+        self.assertEqual(collection, [0, 1, 2])
+
+        context = {"numbers": (n for n in [])}
+        collection, error = get_collection_from_collection_tag("numbers", context, None)
+        self.assertIsNone(collection)
+        self.assertIn("is empty", error)
+
+        context = {"number": 5}
+        collection, error = get_collection_from_collection_tag("number", context, None)
+        self.assertIsNone(collection)
+        self.assertIn("not a collection", error)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,6 @@
 import unittest
+from collections import ChainMap
+
 from office_templates.templating.parse import (
     get_nested_attr,
     evaluate_condition,
@@ -29,6 +31,12 @@ class TestResolver(unittest.TestCase):
         with self.assertRaises(KeyError):
             get_nested_attr(data, "a__x")
 
+    def test_get_nested_attr_mapping(self):
+        # Layered contexts (e.g. per-slide values over a shared context).
+        data = ChainMap({"slide_number": 2}, {"a": {"b": 1}, "slide_number": 1})
+        self.assertEqual(get_nested_attr(data, "slide_number"), 2)
+        self.assertEqual(get_nested_attr(data, "a__b"), 1)
+
     def test_evaluate_condition_true(self):
         # Use a dict.
         data = {"status": "active", "count": 5}
@@ -1,11 +1,15 @@
 import os
 import tempfile
 import unittest
+import zipfile
+from unittest.mock import patch
 
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches
 
 from office_templates.office_renderer import compose_pptx
+from office_templates.office_renderer.pptx import layouts
 
 
 # Dummy objects for testing
@@ -162,6 +166,176 @@ class TestPPTXComposition(unittest.TestCase):
             self.assertEqual(len(layout_shapes), 0, 
                            f"Found %layout% shapes in output slide: {[s.text_frame.text for s in layout_shapes]}")
 
+    def test_compose_leaves_slide_specs_unchanged(self):
+        """Template variables in slide specs are resolved without rewriting the specs."""
+        slide_specs = [
+            {"layout": "content", "title": "{{ user.name }}'s slide"},
+        ]
+
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template1_path],
+            slide_specs=slide_specs,
+            global_context=self.context,
+            output=output_file,
+            use_tagged_layouts=True,
+        )
+        self.assertIsNone(errors)
+        self.assertEqual(slide_specs[0]["title"], "{{ user.name }}'s slide")
+
+    def test_compose_drops_template_slides(self):
+        """Slides of the base template are not saved with the composed deck."""
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template1_path],
+            slide_specs=[{"layout": "Title Slide", "title": "My Title"}],
+            global_context=self.context,
+            output=output_file,
+        )
+        self.assertIsNone(errors)
+
+        with zipfile.ZipFile(output_file) as archive:
+            names = archive.namelist()
+        slide_parts = [n for n in names if n.startswith("ppt/slides/slide")]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(slide_parts), 1)
+
+    def test_compose_reuses_loaded_templates(self):
+        """Composing again from the same template does not reload it."""
+        slide_specs = [{"layout": "content", "title": "Content Title"}]
+
+        def compose_texts():
+            output_file = tempfile.mktemp(suffix=".pptx")
+            self.temp_files.append(output_file)
+            result, errors = compose_pptx(
+                template_files=[self.template1_path],
+                slide_specs=slide_specs,
+                global_context=self.context,
+                output=output_file,
+                use_tagged_layouts=True,
+            )
+            self.assertIsNone(errors)
+            slide = Presentation(output_file).slides[0]
+            return [
+                shape.text_frame.text for shape in slide.shapes if shape.has_text_frame
+            ]
+
+        first_texts = compose_texts()
+        with patch.object(
+            layouts, "Presentation", wraps=layouts.Presentation
+        ) as mock_prs:
+            second_texts = compose_texts()
+        mock_prs.assert_not_called()
+
+        # The cached template was not modified by the first composition
+        self.assertIn("Sales Performance Chart", first_texts)
+        self.assertEqual(second_texts, first_texts)
+
+    def test_clear_layout_cache(self):
+        """Clearing the layout cache makes the next composition reload templates."""
+        slide_specs = [{"layout": "content", "title": "Content Title"}]
+
+        def compose():
+            output_file = tempfile.mktemp(suffix=".pptx")
+            self.temp_files.append(output_file)
+            _, errors = compose_pptx(
+                template_files=[self.template1_path],
+                slide_specs=slide_specs,
+                global_context=self.context,
+                output=output_file,
+                use_tagged_layouts=True,
+            )
+            self.assertIsNone(errors)
+
+        compose()
+        layouts.clear_layout_cache()
+        with patch.object(
+            layouts, "Presentation", wraps=layouts.Presentation
+        ) as mock_prs:
+            compose()
+        mock_prs.assert_called_once()
+
+        # With the cache turned off, every composition loads the template again
+        with patch.object(layouts, "LAYOUT_CACHE_SIZE", 0):
+            layouts.clear_layout_cache()
+            compose()
+            with patch.object(
+                layouts, "Presentation", wraps=layouts.Presentation
+            ) as mock_prs:
+                compose()
+            mock_prs.assert_called_once()
+
+    def test_cached_layouts_not_changed_by_callers(self):
+        """Changing a returned layout mapping leaves the cached one intact."""
+        layouts.clear_layout_cache()
+        first = layouts.load_template_layouts(self.template1_path)
+        first.clear()
+        second = layouts.load_template_layouts(self.template1_path)
+        self.assertIn("Title Slide", second)
+
+    def test_repeated_template_file_object_loaded_once(self):
+        """A file object listed twice is read once rather than from two threads."""
+        layouts.clear_layout_cache()
+        with open(self.template1_path, "rb") as template:
+            with patch.object(
+                layouts, "load_template_layouts", wraps=layouts.load_template_layouts
+            ) as mock_load:
+                mapping = layouts.build_layout_mapping(
+                    [template, self.template2_path, template], use_tagged_layouts=True
+                )
+        self.assertEqual(mock_load.call_count, 2)
+        self.assertIn("content", mapping)
+        self.assertIn("special", mapping)
+
+    def test_compose_downloads_each_image_once(self):
+        """Images shared by several slides are downloaded once, before processing."""
+        from PIL import Image
+
+        from office_templates.office_renderer import images
+
+        image_path = tempfile.mktemp(suffix=".png")
+        self.temp_files.append(image_path)
+        Image.new("RGB", (4, 4), "red").save(image_path)
+
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_textbox(Inches(1), Inches(1), Inches(2), Inches(1)).text = (
+            "% layout picture %"
+        )
+        slide.shapes.add_textbox(Inches(1), Inches(2), Inches(2), Inches(2)).text = (
+            "%image% {{ image_url }}"
+        )
+        template_path = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(template_path)
+        prs.save(template_path)
+
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+        with (
+            patch.object(images, "ALLOW_FILE_IMAGE_URLS", True),
+            patch.object(
+                images, "download_image", wraps=images.download_image
+            ) as mock_download,
+        ):
+            result, errors = compose_pptx(
+                template_files=[template_path],
+                slide_specs=[{"layout": "picture"}, {"layout": "picture"}],
+                global_context={"image_url": f"file://{image_path}"},
+                output=output_file,
+                use_tagged_layouts=True,
+            )
+
+        self.assertIsNone(errors)
+        mock_download.assert_called_once_with(f"file://{image_path}")
+        for slide in Presentation(output_file).slides:
+            self.assertTrue(
+                any(shape.shape_type == MSO_SHAPE_TYPE.PICTURE for shape in slide.shapes)
+            )
+
     def test_compose_with_title_layouts(self):
         """Test composition using slide titles as layout IDs."""
         slide_specs = [
@@ -213,6 +387,49 @@ class TestPPTXComposition(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIsNone(errors)
 
+    def test_compose_fills_placeholders_in_order(self):
+        """Placeholder texts fill the slide's placeholders in shape order."""
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template1_path],
+            slide_specs=[{"layout": "content", "placeholders": ["{{ title }}"]}],
+            global_context=self.context,
+            output=output_file,
+            use_tagged_layouts=True,
+        )
+        self.assertIsNone(errors)
+
+        placeholders = [
+            shape
+            for shape in Presentation(output_file).slides[0].shapes
+            if shape.is_placeholder
+        ]
+        self.assertEqual(placeholders[0].text_frame.text, "Test Presentation")
+        # Placeholders beyond the given texts are left empty
+        self.assertEqual(placeholders[1].text_frame.text, "")
+
+    def test_compose_missing_data_error_lists_context_keys(self):
+        """Missing data errors name the slide's keys without dumping the context."""
+        output_file = tempfile.mktemp(suffix=".pptx")
+        self.temp_files.append(output_file)
+
+        result, errors = compose_pptx(
+            template_files=[self.template1_path],
+            slide_specs=[{"layout": "content", "title": "Content Title"}],
+            global_context={"product_summary": "Secret summary"},
+            output=output_file,
+            use_tagged_layouts=True,
+        )
+
+        self.assertIsNone(result)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("chart_title not found in context (available keys: ", errors[0])
+        self.assertIn("title", errors[0])
+        self.assertNotIn("ChainMap", errors[0])
+        self.assertNotIn("Secret summary", errors[0])
+
     def test_compose_with_missing_layout(self):
         """Test error handling when layout is not found."""
         slide_specs = [
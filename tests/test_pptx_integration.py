@@ -2,13 +2,15 @@ import datetime
 import os
 import tempfile
 import unittest
+import zipfile
+from unittest.mock import patch
 
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches
 
-from office_templates.office_renderer import render_pptx
+from office_templates.office_renderer import images, render_pptx
 
 
 # Dummy objects for integration testing.
@@ -41,6 +43,10 @@ class DummyRequestUser:
 
 class TestRendererIntegration(unittest.TestCase):
     def setUp(self):
+        # Tests serve their images from local files
+        patcher = patch.object(images, "ALLOW_FILE_IMAGE_URLS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         # Create a minimal PPTX with one text box and one table.
         self.prs = Presentation()
         blank_slide = self.prs.slide_layouts[5]
@@ -266,6 +272,34 @@ class TestRendererIntegration(unittest.TestCase):
 
         os.remove(img_file)
 
+    def test_repeated_image_embedded_once(self):
+        """The same image on several slides should be stored as a single media part."""
+
+        from PIL import Image
+
+        img = Image.new("RGB", (2, 2), color="red")
+        img_file = tempfile.mktemp(suffix=".png")
+        img.save(img_file)
+
+        for _ in range(3):
+            slide = self.prs.slides.add_slide(self.prs.slide_layouts[5])
+            for top in (Inches(1), Inches(4)):
+                box = slide.shapes.add_textbox(Inches(0.5), top, Inches(2), Inches(2))
+                box.text_frame.text = f"%imagesqueeze% file://{img_file}"
+
+        self.prs.save(self.temp_input)
+
+        rendered, errors = render_pptx(
+            self.temp_input, self.context, self.temp_output, None
+        )
+        self.assertIsNone(errors)
+
+        with zipfile.ZipFile(rendered) as z:
+            media = [name for name in z.namelist() if name.startswith("ppt/media/")]
+        self.assertEqual(len(media), 1)
+
+        os.remove(img_file)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,13 @@
 import os
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from pptx import Presentation
 from pptx.util import Inches
 
 from office_templates.office_renderer import render_pptx
+from office_templates.office_renderer.pptx.render import process_single_slide
 
 from tests.utils import has_view_permission
 
@@ -109,6 +111,74 @@ class TestRendererUnit(unittest.TestCase):
         )
         self.assertTrue(len(errors) == 1)
 
+    def test_fail_fast(self):
+        # Errors on two slides: by default rendering stops at the first one.
+        self.textframe.paragraphs[0].text = "{{ user.missing_one }}"
+        slide2 = self.prs.slides.add_slide(self.prs.slide_layouts[5])
+        textbox2 = slide2.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+        textbox2.text_frame.text = "{{ user.missing_two }}"
+        self.prs.save(self.temp_input)
+
+        rendered, errors = render_pptx(
+            self.temp_input, self.context, self.temp_output, None
+        )
+        self.assertIsNone(rendered)
+        self.assertEqual(len(errors), 1)
+
+        rendered, errors = render_pptx(
+            self.temp_input, self.context, self.temp_output, None, fail_fast=False
+        )
+        self.assertIsNone(rendered)
+        self.assertEqual(len(errors), 2)
+
+    def test_missing_data_error_lists_context_keys(self):
+        # The error names the available keys rather than dumping the context.
+        self.textframe.paragraphs[0].text = "{{ missing }}"
+        self.prs.save(self.temp_input)
+
+        _, errors = render_pptx(self.temp_input, self.context, self.temp_output, None)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("missing not found in context (available keys: ", errors[0])
+        self.assertIn("slide_number", errors[0])
+        self.assertIn("user", errors[0])
+        self.assertNotIn("ChainMap", errors[0])
+        self.assertNotIn("alice@example.com", errors[0])
+
+    def test_fail_fast_skips_later_image_downloads(self):
+        # Images on slides after the first error are never downloaded.
+        self.textframe.paragraphs[0].text = "{{ user.missing_one }}"
+        slide2 = self.prs.slides.add_slide(self.prs.slide_layouts[5])
+        textbox2 = slide2.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+        textbox2.text_frame.text = "%image% http://example.com/image.png"
+        self.prs.save(self.temp_input)
+
+        with patch("office_templates.office_renderer.images.download_image") as mock:
+            rendered, errors = render_pptx(
+                self.temp_input, self.context, self.temp_output, None
+            )
+        self.assertIsNone(rendered)
+        self.assertEqual(len(errors), 1)
+        mock.assert_not_called()
+
+    def test_process_single_slide_removes_loop_directives(self):
+        # Loop directive shapes are dropped; other shapes are rendered.
+        directive = self.slide.shapes.add_textbox(
+            Inches(1), Inches(3), Inches(4), Inches(1)
+        )
+        directive.text_frame.text = "%loop user in users%"
+        errors = []
+        process_single_slide(
+            self.slide,
+            context=self.context,
+            slide_number=1,
+            check_permissions=None,
+            errors=errors,
+        )
+        self.assertEqual(errors, [])
+        texts = [s.text_frame.text for s in self.slide.shapes if s.has_text_frame]
+        self.assertIn("Hello, Alice", texts)
+        self.assertNotIn("%loop user in users%", texts)
+
 
 if __name__ == "__main__":
     unittest.main()
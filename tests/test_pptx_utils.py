@@ -0,0 +1,291 @@
+import hashlib
+import tempfile
+import unittest
+import warnings
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.util import Inches
+
+from office_templates.office_renderer.pptx.utils import (
+    copy_slide_across_presentations,
+    duplicate_slide,
+    has_text_frame,
+    save_presentation,
+    shape_text,
+)
+
+
+class TestDuplicateSlide(unittest.TestCase):
+    def setUp(self):
+        self.prs = Presentation()
+        self.slide = self.prs.slides.add_slide(self.prs.slide_layouts[5])
+        self.slide.shapes.title.text = "Title"
+        for i in range(3):
+            box = self.slide.shapes.add_textbox(
+                Inches(1), Inches(1 + i), Inches(2), Inches(0.5)
+            )
+            box.text_frame.text = f"Box {i}"
+        self.other = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+
+    def test_duplicate_copies_shapes_in_order(self):
+        """The duplicate should contain copies of the source shapes, in order."""
+        new_slide = duplicate_slide(self.prs, self.slide)
+
+        source_texts = [shape.text_frame.text for shape in self.slide.shapes]
+        new_texts = [shape.text_frame.text for shape in new_slide.shapes]
+        self.assertEqual(new_texts, source_texts)
+
+        # Copies are independent of the source
+        new_slide.shapes[1].text_frame.text = "Changed"
+        self.assertEqual(self.slide.shapes[1].text_frame.text, "Box 0")
+
+    def test_duplicate_position(self):
+        """The duplicate is placed after the source unless an index is given."""
+        new_slide = duplicate_slide(self.prs, self.slide)
+        self.assertEqual(self.prs.slides.index(new_slide), 1)
+
+        last_slide = duplicate_slide(self.prs, self.slide, 3)
+        self.assertEqual(self.prs.slides.index(last_slide), 3)
+
+    def test_duplicate_relinks_pictures(self):
+        """Pictures on the duplicate reference the image through its own slide."""
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), "red").save(buffer, format="PNG")
+        buffer.seek(0)
+        self.slide.shapes.add_picture(buffer, Inches(4), Inches(1))
+
+        new_slide = duplicate_slide(self.prs, self.slide)
+
+        source_pic = self.slide.shapes[-1]
+        new_pic = new_slide.shapes[-1]
+        self.assertIn(new_pic._element.blip_rId, new_slide.part.rels)
+        self.assertEqual(new_pic.image.sha1, source_pic.image.sha1)
+
+        # The saved deck opens with the image intact on both slides
+        output = BytesIO()
+        self.prs.save(output)
+        output.seek(0)
+        reloaded = Presentation(output)
+        self.assertEqual(
+            reloaded.slides[1].shapes[-1].image.sha1, source_pic.image.sha1
+        )
+
+    def test_duplicate_copies_charts(self):
+        """Charts on the duplicate can be changed without touching the source."""
+        chart_data = CategoryChartData()
+        chart_data.categories = ["A", "B"]
+        chart_data.add_series("Series", (1, 2))
+        self.slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED,
+            Inches(4), Inches(1), Inches(4), Inches(3),
+            chart_data,
+        )
+
+        new_slide = duplicate_slide(self.prs, self.slide)
+        new_data = CategoryChartData()
+        new_data.categories = ["A", "B"]
+        new_data.add_series("Series", (3, 4))
+        new_slide.shapes[-1].chart.replace_data(new_data)
+
+        source_chart = self.slide.shapes[-1].chart
+        self.assertEqual(list(source_chart.plots[0].series[0].values), [1, 2])
+        self.assertEqual(
+            list(new_slide.shapes[-1].chart.plots[0].series[0].values), [3, 4]
+        )
+
+        output = BytesIO()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.prs.save(output)
+
+
+class TestCopySlideAcrossPresentations(unittest.TestCase):
+    def test_copy_adds_pictures_to_destination(self):
+        """Pictures are added to the destination deck under its own part names."""
+        from PIL import Image
+
+        source = Presentation()
+        source_slide = source.slides.add_slide(source.slide_layouts[6])
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), "blue").save(buffer, format="PNG")
+        buffer.seek(0)
+        source_slide.shapes.add_picture(buffer, Inches(1), Inches(1))
+
+        # The destination already holds the same image under the same part name
+        dest = Presentation()
+        buffer.seek(0)
+        dest_pic = dest.slides.add_slide(dest.slide_layouts[6]).shapes.add_picture(
+            buffer, Inches(1), Inches(1)
+        )
+        new_slide = copy_slide_across_presentations(dest, source_slide)
+
+        new_pic = new_slide.shapes[-1]
+        self.assertIs(
+            new_slide.part.related_part(new_pic._element.blip_rId),
+            dest_pic.part.related_part(dest_pic._element.blip_rId),
+        )
+        output = BytesIO()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            dest.save(output)
+
+    def test_repeated_copies_share_and_hash_images_once(self):
+        """Each copied image is hashed once and shared by every copy."""
+        from PIL import Image
+
+        source = Presentation()
+        source_slide = source.slides.add_slide(source.slide_layouts[6])
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), "blue").save(buffer, format="PNG")
+        buffer.seek(0)
+        source_slide.shapes.add_picture(buffer, Inches(1), Inches(1))
+
+        dest = Presentation()
+        with patch("hashlib.sha1", wraps=hashlib.sha1) as mock_sha1:
+            copies = [
+                copy_slide_across_presentations(dest, source_slide) for _ in range(3)
+            ]
+
+        self.assertEqual(mock_sha1.call_count, 3)
+        parts = {
+            slide.part.related_part(slide.shapes[-1]._element.blip_rId)
+            for slide in copies
+        }
+        self.assertEqual(len(parts), 1)
+
+    def test_copy_keeps_images_python_pptx_cannot_decode(self):
+        """Images such as SVG are copied as raw parts rather than decoded."""
+        from PIL import Image
+
+        source = Presentation()
+        source_slide = source.slides.add_slide(source.slide_layouts[6])
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), "blue").save(buffer, format="PNG")
+        buffer.seek(0)
+        pic = source_slide.shapes.add_picture(buffer, Inches(1), Inches(1))
+
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="4" height="4"/>'
+        svg_part = Part(
+            PackURI("/ppt/media/image9.svg"), "image/svg+xml", source.part.package, svg
+        )
+        pic._element.blipFill.blip.set(
+            qn("r:embed"), source_slide.part.relate_to(svg_part, RT.IMAGE)
+        )
+
+        dest = Presentation()
+        new_slide = copy_slide_across_presentations(dest, source_slide)
+
+        new_pic = new_slide.shapes[-1]
+        new_part = new_slide.part.related_part(new_pic._element.blip_rId)
+        self.assertEqual(new_part.content_type, "image/svg+xml")
+        self.assertEqual(new_part.blob, svg)
+        self.assertIs(new_part.package, dest.part.package)
+
+        output = BytesIO()
+        dest.save(output)
+
+    def test_copy_drops_references_it_cannot_carry_over(self):
+        """References to parts of the source deck are removed from the copy."""
+        source = Presentation()
+        source_slide = source.slides.add_slide(source.slide_layouts[6])
+        other_slide = source.slides.add_slide(source.slide_layouts[6])
+        box = source_slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1))
+        box.click_action.target_slide = other_slide
+
+        dest = Presentation()
+        new_slide = copy_slide_across_presentations(dest, source_slide)
+
+        hlink = new_slide.shapes[-1]._element.find(".//" + qn("a:hlinkClick"))
+        self.assertIsNotNone(hlink)
+        self.assertNotIn(qn("r:id"), hlink.attrib)
+
+        output = BytesIO()
+        dest.save(output)
+
+
+class TestHasTextFrame(unittest.TestCase):
+    def test_has_text_frame(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1))
+        connector = slide.shapes.add_connector(1, 0, 0, Inches(1), Inches(1))
+
+        # Repeated calls hit the per-class cache and give the same answer
+        for _ in range(2):
+            self.assertTrue(has_text_frame(textbox))
+            self.assertFalse(has_text_frame(connector))
+
+        self.assertFalse(has_text_frame(MagicMock(spec=[])))
+
+    def test_shape_text(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1))
+        textbox.text_frame.text = "Hello"
+        connector = slide.shapes.add_connector(1, 0, 0, Inches(1), Inches(1))
+
+        self.assertEqual(shape_text(textbox), "Hello")
+        self.assertIsNone(shape_text(connector))
+
+
+class TestSavePresentation(unittest.TestCase):
+    def test_seekable_file_saved_directly_and_rewound(self):
+        """Seekable files are saved to directly, then rewound for reading."""
+        prs = Presentation()
+        prs.slides.add_slide(prs.slide_layouts[6])
+
+        with tempfile.TemporaryFile() as output:
+            with patch.object(prs, "save", wraps=prs.save) as mock_save:
+                save_presentation(prs, output)
+
+            mock_save.assert_called_once_with(output)
+            self.assertEqual(output.tell(), 0)
+            reloaded = Presentation(output)
+        self.assertEqual(len(reloaded.slides), 1)
+
+    def test_other_streams_written_once(self):
+        """Streams other than files and buffers receive the package in one write."""
+
+        class WriteOnlyStream:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, data):
+                self.chunks.append(bytes(data))
+                return len(data)
+
+            def flush(self):
+                pass
+
+            def seekable(self):
+                return False
+
+        class RemoteStream(WriteOnlyStream):
+            def seekable(self):
+                return True
+
+            def seek(self, *args):
+                return 0
+
+        prs = Presentation()
+        prs.slides.add_slide(prs.slide_layouts[6])
+        for stream in (WriteOnlyStream(), RemoteStream()):
+            save_presentation(prs, stream)
+
+            self.assertEqual(len(stream.chunks), 1)
+            reloaded = Presentation(BytesIO(stream.chunks[0]))
+            self.assertEqual(len(reloaded.slides), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
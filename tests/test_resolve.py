@@ -170,6 +170,23 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(MissingDataException):
             resolve_formatted_tag("nonexistent", context)
 
+    def test_missing_data_message_names_the_right_mapping(self):
+        # Missing keys are reported against the context or the nested dict,
+        # listing at most the first ten keys.
+        context = {"user": {"name": "Alice", "email": "alice@example.com"}}
+        with self.assertRaises(MissingDataException) as cm:
+            resolve_formatted_tag("user.missing", context)
+        self.assertEqual(str(cm.exception), "missing not found in dict with keys: name, email")
+
+        context.update({f"key{i}": i for i in range(300)})
+        with self.assertRaises(MissingDataException) as cm:
+            resolve_formatted_tag("missing", context)
+        self.assertEqual(
+            str(cm.exception),
+            "missing not found in context (available keys: user, key0, key1, key2, key3, "
+            "key4, key5, key6, key7, key8, ... 291 more)",
+        )
+
     def test_simple_nested_lookup(self):
         # With the context having nested dictionary.
         context = {"user": {"name": "Alice"}}
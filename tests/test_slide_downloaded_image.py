@@ -8,11 +8,21 @@ from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches
 from PIL import Image
 
-from office_templates.office_renderer.images import replace_shape_with_image, ImageError
+from office_templates.office_renderer import images
+from office_templates.office_renderer.images import (
+    prefetch_images,
+    replace_shape_with_image,
+    ImageError,
+)
+from office_templates.office_renderer.pptx.render import process_single_slide
 
 
 class TestSlideDownloadedImage(unittest.TestCase):
     def setUp(self):
+        # Tests serve their images from local files
+        patcher = patch.object(images, "ALLOW_FILE_IMAGE_URLS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.prs = Presentation()
         self.slide = self.prs.slides.add_slide(self.prs.slide_layouts[5])
         self.textbox = self.slide.shapes.add_textbox(
@@ -52,6 +62,24 @@ class TestSlideDownloadedImage(unittest.TestCase):
         with self.assertRaises(ImageError):
             replace_shape_with_image(self.textbox, self.slide, context={})
 
+    @patch("office_templates.office_renderer.images.urlopen")
+    def test_unsupported_url_scheme_raises_image_error(self, mock_urlopen):
+        """URLs with unsupported schemes are rejected before any download."""
+        for url in ["ftp://example.com/foo.png", "example.com/foo.png"]:
+            self.textbox.text_frame.text = f"%image% {url}"
+            with self.assertRaises(ImageError):
+                replace_shape_with_image(self.textbox, self.slide, context={})
+        mock_urlopen.assert_not_called()
+
+    @patch("office_templates.office_renderer.images.urlopen")
+    def test_file_urls_rejected_unless_allowed(self, mock_urlopen):
+        """Local file URLs are only followed when explicitly allowed."""
+        self.textbox.text_frame.text = f"%image% file://{self.temp_image}"
+        with patch.object(images, "ALLOW_FILE_IMAGE_URLS", False):
+            with self.assertRaises(ImageError):
+                replace_shape_with_image(self.textbox, self.slide, context={})
+        mock_urlopen.assert_not_called()
+
     def test_image_aspect_ratio_fitting(self):
         """%image% should keep aspect ratio inside the shape."""
 
@@ -77,6 +105,102 @@ class TestSlideDownloadedImage(unittest.TestCase):
         pic = [s for s in self.slide.shapes if s.left == shape.left and s.top == shape.top and s.shape_type == MSO_SHAPE_TYPE.PICTURE]
         self.assertEqual(len(pic), 1)
 
+    def test_prefetch_images_deduplicates_and_records_failures(self):
+        """Each distinct URL is downloaded once and failures are kept as errors."""
+        url = f"file://{self.temp_image}"
+        missing = "file:///nonexistent/image.png"
+
+        cache = prefetch_images([url, missing, url])
+
+        self.assertEqual(list(cache), [url, missing])
+        with open(self.temp_image, "rb") as f:
+            self.assertEqual(cache[url], f.read())
+        self.assertIsInstance(cache[missing], ImageError)
+
+    def test_image_urls_resolved_once_per_shape(self):
+        """Each image URL is resolved once, and that URL is the one downloaded."""
+
+        class Signer:
+            def __init__(self, path):
+                self.path = path
+                self.calls = 0
+
+            def url(self):
+                # A URL that differs on every call, like a presigned URL
+                self.calls += 1
+                return f"file://{self.path}#{self.calls}"
+
+        signer = Signer(self.temp_image)
+        self.textbox.text_frame.text = "%image% {{ signer.url() }}"
+        for i in range(2):
+            box = self.slide.shapes.add_textbox(
+                Inches(3 + i), Inches(3), Inches(1), Inches(1)
+            )
+            box.text_frame.text = "%image% {{ signer.url() }}"
+
+        errors = []
+        with patch(
+            "office_templates.office_renderer.images.download_image",
+            wraps=images.download_image,
+        ) as mock_download:
+            process_single_slide(
+                self.slide,
+                context={"signer": signer},
+                slide_number=1,
+                check_permissions=None,
+                errors=errors,
+            )
+
+        self.assertEqual(errors, [])
+        self.assertEqual(signer.calls, 3)
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_download.call_args_list),
+            [f"file://{self.temp_image}#{n}" for n in (1, 2, 3)],
+        )
+        pictures = [
+            s for s in self.slide.shapes if s.shape_type == MSO_SHAPE_TYPE.PICTURE
+        ]
+        self.assertEqual(len(pictures), 3)
+
+    def test_failed_download_not_retried(self):
+        """A URL that failed to download is reported without downloading it again."""
+        self.textbox.text_frame.text = "%image% file:///nonexistent/image.png"
+        box = self.slide.shapes.add_textbox(Inches(3), Inches(3), Inches(1), Inches(1))
+        box.text_frame.text = "%image% file:///nonexistent/image.png"
+
+        errors = []
+        with patch(
+            "office_templates.office_renderer.images.download_image",
+            wraps=images.download_image,
+        ) as mock_download:
+            process_single_slide(
+                self.slide,
+                context={},
+                slide_number=1,
+                check_permissions=None,
+                errors=errors,
+            )
+
+        mock_download.assert_called_once_with("file:///nonexistent/image.png")
+        self.assertEqual(len(errors), 2)
+
+    @patch("office_templates.office_renderer.images.urlopen")
+    def test_image_cache_avoids_download(self, mock_urlopen):
+        """A URL already in the image cache should not be downloaded again."""
+        url = f"file://{self.temp_image}"
+        with open(self.temp_image, "rb") as f:
+            image_cache = {url: f.read()}
+
+        replace_shape_with_image(
+            self.textbox, self.slide, context=self.context, image_cache=image_cache
+        )
+
+        mock_urlopen.assert_not_called()
+        pictures = [
+            s for s in self.slide.shapes if s.shape_type == MSO_SHAPE_TYPE.PICTURE
+        ]
+        self.assertEqual(len(pictures), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -35,6 +35,21 @@ class TestTablesIntegration(unittest.TestCase):
         # Optional: check that the shape is truly a table
         self.assertEqual(table_shape.shape_type, MSO_SHAPE_TYPE.TABLE)
 
+    def test_static_text_left_untouched(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        table_shape = slide.shapes.add_table(1, 1, 100000, 100000, 5000000, 200000)
+        cell = table_shape.table.cell(0, 0)
+        cell.text = "  Static label  "
+        run = cell.text_frame.paragraphs[0].runs[0]
+        run.font.bold = True
+
+        process_table_cell(cell, {}, None)
+
+        # Text (including whitespace) and run formatting are unchanged
+        self.assertEqual(cell.text, "  Static label  ")
+        self.assertTrue(cell.text_frame.paragraphs[0].runs[0].font.bold)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,6 +8,7 @@ from office_templates.templating.exceptions import (
     PermissionDeniedException,
     MissingDataException,
 )
+from office_templates.templating import core
 from office_templates.templating.core import process_text
 
 from tests.utils import has_view_permission
@@ -152,6 +153,27 @@ class TestTemplatingNormalMode(unittest.TestCase):
         )
         self.assertEqual(result, expected)
 
+    def test_repeated_template_resolves_each_context(self):
+        # The same template text rendered against different contexts (as on
+        # slides generated from a loop) resolves against each context.
+        tpl = "The user is: {{ user.name }}."
+        for user in (self.user1, self.user2):
+            result = process_text(tpl, {"user": user}, check_permissions=None)
+            self.assertEqual(result, f"The user is: {user.name}.")
+
+    def test_tag_cache_toggle(self):
+        # Only texts holding a tag are cached, and caching can be turned off.
+        core.clear_tag_cache()
+        process_text("No tags here", self.context)
+        process_text("The user is: {{ user.name }}.", self.context)
+        self.assertEqual(core._parse_tags.cache_info().currsize, 1)
+
+        core.clear_tag_cache()
+        with patch.object(core, "CACHE_PARSED_TAGS", False):
+            result = process_text("The user is: {{ user.name }}.", self.context)
+        self.assertEqual(result, f"The user is: {self.user1.name}.")
+        self.assertEqual(core._parse_tags.cache_info().currsize, 0)
+
     def test_mixed_text_list(self):
         # Mixed text with a placeholder that resolves to a list should join the list.
         tpl = "All emails: {{ program.users.email }} are active."
@@ -111,6 +111,25 @@ class TestProcessWorksheet(unittest.TestCase):
         self.assertEqual(plain_cell.value, "Plain text")
         self.assertEqual(self.cell1.value, "Hello, Alice")
 
+    @patch("office_templates.office_renderer.xlsx.worksheets.process_text_list")
+    def test_non_text_cells_skipped(self, mock_process_text_list):
+        """Empty and numeric cells are left as they are without processing."""
+        empty_cell = MagicMock()
+        empty_cell.value = None
+        number_cell = MagicMock()
+        number_cell.value = 42
+        self.worksheet.iter_cols.return_value = [[empty_cell, number_cell, self.cell1]]
+        mock_process_text_list.return_value = ["Hello, Alice"]
+
+        process_worksheet(
+            worksheet=self.worksheet, context=self.context, check_permissions=None
+        )
+
+        mock_process_text_list.assert_called_once()
+        self.assertIsNone(empty_cell.value)
+        self.assertEqual(number_cell.value, 42)
+        self.assertEqual(self.cell1.value, "Hello, Alice")
+
     @patch("office_templates.office_renderer.xlsx.worksheets.process_text_list")
     def test_list_expansion(self, mock_process_text_list):
         """Test that a cell with a list placeholder expands to multiple rows."""
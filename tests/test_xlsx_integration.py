@@ -4,7 +4,7 @@ import unittest
 from unittest.mock import patch
 from openpyxl import Workbook, load_workbook
 
-from office_templates.office_renderer import render_xlsx
+from office_templates.office_renderer import images, render_xlsx
 
 from tests.utils import has_view_permission
 
@@ -41,6 +41,10 @@ class DummyRequestUser:
 
 class TestXlsxIntegration(unittest.TestCase):
     def setUp(self):
+        # Tests serve their images from local files
+        patcher = patch.object(images, "ALLOW_FILE_IMAGE_URLS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         # Create a minimal XLSX workbook with sample data and templates
         self.wb = Workbook()
 